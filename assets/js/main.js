@@ -8,6 +8,20 @@ document.addEventListener('DOMContentLoaded', () => {
     fetchData();
 });
 
+// Local image -> {width, height, srcset}, from the site data bundle
+let siteImages = {};
+// Must match PROFILE_IMAGE_SIZES and PROJECT_IMAGE_SIZES in build.py
+const PROFILE_IMAGE_SIZES = '300px';
+const PROJECT_IMAGE_SIZES = '(max-width: 1200px) 50vw, 33vw';
+
+// Mirrors image_attrs() in build.py
+function imageAttrs(src, sizes) {
+    const image = siteImages[src];
+    if (!image) return '';
+    const srcset = image.srcset ? ` srcset="${image.srcset}" sizes="${sizes}"` : '';
+    return ` width="${image.width}" height="${image.height}"${srcset}`;
+}
+
 function getProfileImageSrc() {
     const isLight = document.documentElement.getAttribute('data-theme') === 'light';
     return isLight ? 'assets/img/me_light.png' : 'assets/img/me.jpg';
@@ -15,25 +29,54 @@ function getProfileImageSrc() {
 
 function updateProfileImage() {
     const src = getProfileImageSrc();
+    const info = siteImages[src];
 
     // Support both static prebuilt markup and JS-rendered markup.
     const images = document.querySelectorAll('#about .about-photo img');
     images.forEach((image) => {
+        if (image.getAttribute('src') === src) return;
+        // srcset would win over the new src, so swap it along with the size
+        if (info && info.srcset) {
+            image.srcset = info.srcset;
+            image.sizes = PROFILE_IMAGE_SIZES;
+        } else {
+            image.removeAttribute('srcset');
+            image.removeAttribute('sizes');
+        }
+        if (info) {
+            image.width = info.width;
+            image.height = info.height;
+        } else {
+            image.removeAttribute('width');
+            image.removeAttribute('height');
+        }
         image.src = src;
     });
 }
 
+// Prefer the single content-hashed bundle that build.py preloads in <head>
+async function loadSiteData() {
+    const bundle = document.getElementById('site-data');
+    if (bundle) {
+        return fetch(bundle.href).then(r => r.json());
+    }
+
+    const opts = { cache: 'no-store' };
+    const [profile, pubs, projects, experience, education, interests] = await Promise.all([
+        fetch('data/profile.json', opts).then(r => r.json()),
+        fetch('data/publications.json', opts).then(r => r.json()),
+        fetch('data/projects.json', opts).then(r => r.json()),
+        fetch('data/experience.json', opts).then(r => r.json()),
+        fetch('data/education.json', opts).then(r => r.json()),
+        fetch('data/interests.json', opts).then(r => r.json())
+    ]);
+    return { profile, pubs, projects, experience, education, interests };
+}
+
 async function fetchData() {
     try {
-        const opts = { cache: 'no-store' };
-        const [profile, pubs, projects, experience, education, interests] = await Promise.all([
-            fetch('data/profile.json', opts).then(r => r.json()),
-            fetch('data/publications.json', opts).then(r => r.json()),
-            fetch('data/projects.json', opts).then(r => r.json()),
-            fetch('data/experience.json', opts).then(r => r.json()),
-            fetch('data/education.json', opts).then(r => r.json()),
-            fetch('data/interests.json', opts).then(r => r.json())
-        ]);
+        const { profile, pubs, projects, experience, education, interests, images } = await loadSiteData();
+        siteImages = images || {};
 
         renderAbout(profile, education, interests);
         renderExperience(experience);
@@ -88,7 +131,7 @@ function renderAbout(profile, education, interests) {
     container.innerHTML = `
         <div class="about-content">
             <div class="about-photo">
-                 <img id="profile-image" src="${getProfileImageSrc()}" alt="${profile.name}">
+                 <img id="profile-image" src="${getProfileImageSrc()}" alt="${profile.name}"${imageAttrs(getProfileImageSrc(), PROFILE_IMAGE_SIZES)}>
                  <h1 style="font-size: 2rem; margin: 1rem 0 0.5rem;">${profile.name}</h1>
                  <p style="font-size: 1.1rem; color: var(--text-muted); margin-bottom: 1rem;">${profile.role}<br>at ${profile.org}</p>
                  <div class="about-links">
@@ -245,7 +288,7 @@ function renderProjects(projects) {
 
     const html = projects.map(p => `
         <div class="card">
-            ${p.image ? `<img src="${p.image}" alt="${p.name}" loading="lazy">` : ''}
+            ${p.image ? `<img src="${p.image}" alt="${p.name}"${imageAttrs(p.image, PROJECT_IMAGE_SIZES)} loading="lazy">` : ''}
             <div style="flex-grow: 1;">
                 <h3><a href="${p.href}" target="_blank">${p.name}</a></h3>
                 <p>${p.desc}</p>
@@ -14,24 +14,36 @@ document.addEventListener('DOMContentLoaded', () => {
 
 async function loadPublication(id) {
     try {
-        const res = await fetch('/data/publications.json', { cache: 'no-store' });
-        const pubs = await res.json();
-        const pub = pubs.find(p => p.id === id);
+        const detail = document.getElementById('pub-detail');
+        let pub;
+        if (detail.dataset.pubSrc && detail.dataset.pubId === id) {
+            // Content-hashed record written next to the page by build.py
+            const res = await fetch(detail.dataset.pubSrc);
+            pub = await res.json();
+        } else {
+            const res = await fetch('/data/publications.json', { cache: 'no-store' });
+            const pubs = await res.json();
+            pub = pubs.find(p => p.id === id);
+        }
         
         if (!pub) {
             document.getElementById('pub-detail').innerHTML = '<p>Publication not found.</p>';
             return;
         }
         
-        renderPublication(pub);
+        await renderPublication(pub);
     } catch (e) {
         console.error('Error loading publication:', e);
         document.getElementById('pub-detail').innerHTML = '<p>Error loading content.</p>';
     }
 }
 
-function renderPublication(pub) {
+async function renderPublication(pub) {
     const container = document.getElementById('pub-detail');
+    const authorLinks = await Promise.all((pub.authors || []).map(async a =>
+        `<a href="${await listingUrl('author', a)}">${a}</a>`));
+    const tagLinks = await Promise.all((pub.tags || []).map(async t =>
+        `<a href="${await listingUrl('tag', t)}" class="badge">${t}</a>`));
     
     document.title = `${pub.title} - Publications`;
     
@@ -42,7 +54,7 @@ function renderPublication(pub) {
         </div>
         
         <div class="pub-authors" style="font-size: 1.1rem; margin-bottom: 1rem;">
-            <strong>Authors:</strong> ${pub.authors.map(a => `<a href="index.html?q=${encodeURIComponent(a)}">${a}</a>`).join(', ')}
+            <strong>Authors:</strong> ${authorLinks.join(', ')}
         </div>
         
         <div class="pub-links" style="margin-bottom: 2rem;">
@@ -57,7 +69,7 @@ function renderPublication(pub) {
         ${pub.tags ? `
         <div class="pub-tags">
             <strong>Tags:</strong> 
-            ${pub.tags.map(t => `<a href="index.html?q=${encodeURIComponent(t)}" class="badge">${t}</a>`).join(' ')}
+            ${tagLinks.join(' ')}
         </div>
         ` : ''}
         
@@ -67,11 +79,27 @@ function renderPublication(pub) {
     `;
 }
 
+// Must match slugify() in build.py
 function slugify(text) {
-    return text.toString().toLowerCase()
-        .replace(/\s+/g, '-')           // Replace spaces with -
-        .replace(/[^\w\-]+/g, '')       // Remove all non-word chars
-        .replace(/\-\-+/g, '-')         // Replace multiple - with single -
-        .replace(/^-+/, '')             // Trim - from start of text
-        .replace(/-+$/, '');            // Trim - from end of text
+    return text.toString().normalize('NFKD').replace(/[^\x00-\x7f]/g, '').toLowerCase()
+        .replace(/[^a-z0-9]+/g, '-')    // Runs of anything else become one -
+        .replace(/^-+|-+$/g, '');       // Trim - from both ends
+}
+
+// Must match name_slug() in build.py: names with no usable slug are hashed
+async function nameSlug(name) {
+    const slug = slugify(name);
+    if (slug) return slug;
+    const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(name));
+    return [...new Uint8Array(digest)].map(b => b.toString(16).padStart(2, '0')).join('').slice(0, 10);
+}
+
+// Author/tag listing page built by build.py; falls back to search where hashing
+// is unavailable (crypto.subtle needs a secure context)
+async function listingUrl(kind, name) {
+    try {
+        return `/publications/${kind}/${await nameSlug(name)}/`;
+    } catch (e) {
+        return `/publications/?q=${encodeURIComponent(name)}`;
+    }
 }
@@ -3,30 +3,41 @@ document.addEventListener('DOMContentLoaded', () => {
     initPublications();
 });
 
-let allPubs = [];
+// .pub-item elements, in list order (year desc)
+let pubItems = [];
+// The items pre-rendered on this page, shown when no filter is active
+let pageItems = new Set();
+let catalogueLoaded = null;
+// data/search-index.json, built by build.py
+let searchIndex = null;
+const shardCache = {};
 
 async function initPublications() {
+    pubItems = [...document.querySelectorAll('#pub-list .pub-item')];
+    pageItems = new Set(pubItems);
+
+    setupFilters();
+    readUrlParams();
+
+    document.getElementById('q').addEventListener('input', handleFilterChange);
+    document.getElementById('year').addEventListener('change', handleFilterChange);
+
     try {
-        const res = await fetch('../data/publications.json', { cache: 'no-store' });
-        allPubs = await res.json();
-        
-        setupFilters();
-        readUrlParams();
-        renderPubs();
-        
-        // Listeners
-        document.getElementById('q').addEventListener('input', handleFilterChange);
-        document.getElementById('year').addEventListener('change', handleFilterChange);
-        document.getElementById('type').addEventListener('change', handleFilterChange);
-        
+        const res = await fetch('../data/search-index.json');
+        searchIndex = await res.json();
     } catch (e) {
-        console.error('Error loading publications:', e);
+        console.error('Error loading search index:', e);
     }
+    renderPubs();
 }
 
 function setupFilters() {
-    const years = [...new Set(allPubs.map(p => p.year))].sort((a, b) => b - a);
-    
+    // Facet links cover the whole catalogue, the page only its first items
+    const facetYears = [...document.querySelectorAll('#pub-facets [data-year]')].map(a => a.dataset.year);
+    const years = facetYears.length
+        ? facetYears
+        : [...new Set(pubItems.map(el => el.dataset.year))].sort((a, b) => b - a);
+
     const yearSelect = document.getElementById('year');
     years.forEach(y => {
         const opt = document.createElement('option');
@@ -40,7 +51,7 @@ function readUrlParams() {
     const params = new URLSearchParams(window.location.search);
     const q = params.get('q') || '';
     const year = params.get('year') || '';
-    
+
     document.getElementById('q').value = q;
     document.getElementById('year').value = year;
 }
@@ -48,11 +59,11 @@ function readUrlParams() {
 function updateUrlParams() {
     const q = document.getElementById('q').value;
     const year = document.getElementById('year').value;
-    
+
     const params = new URLSearchParams();
     if (q) params.set('q', q);
     if (year) params.set('year', year);
-    
+
     const newUrl = `${window.location.pathname}?${params.toString()}`;
     window.history.replaceState({}, '', newUrl);
 }
@@ -62,45 +73,117 @@ function handleFilterChange() {
     renderPubs();
 }
 
-function renderPubs() {
-    const q = document.getElementById('q').value.toLowerCase();
-    const year = document.getElementById('year').value;
-    
-    const filtered = allPubs.filter(p => {
-        const matchesQ = !q || 
-            p.title.toLowerCase().includes(q) || 
-            p.authors.some(a => a.toLowerCase().includes(q));
-            
-        const matchesYear = !year || p.year.toString() === year;
-        
-        return matchesQ && matchesYear;
-    });
-    
-    // Sort by year desc
-    filtered.sort((a, b) => b.year - a.year);
-    
-    const container = document.getElementById('pub-list');
-    
-    if (filtered.length === 0) {
-        container.innerHTML = '<p>No publications found.</p>';
-        return;
-    }
-    
-    container.innerHTML = filtered.map(p => `
-        <div class="pub-item">
+// Must match search_tokens() in build.py
+function searchTokens(text) {
+    return text.normalize('NFKD').replace(/[^\x00-\x7f]/g, '').toLowerCase().match(/[a-z0-9]+/g) || [];
+}
+
+async function loadTerms(word) {
+    if (searchIndex.terms) return [searchIndex.terms];
+    const keys = word.length >= 2
+        ? searchIndex.shards.filter(k => k === word.slice(0, 2))
+        : searchIndex.shards.filter(k => k.startsWith(word));
+    return Promise.all(keys.map(key => {
+        if (!shardCache[key]) {
+            shardCache[key] = fetch(`../data/search/${key}.json`)
+                .then(r => r.json())
+                .then(shard => shard.terms);
+        }
+        return shardCache[key];
+    }));
+}
+
+// Mirrors PUB_LIST_ITEM in build.py, minus the abstract (not in the slim catalogue)
+function renderPubItem(p) {
+    const el = document.createElement('div');
+    el.className = 'pub-item';
+    el.dataset.id = p.id;
+    el.dataset.year = p.year;
+    el.innerHTML = `
             <a href="${p.id}/" class="pub-title">${p.title}</a>
             <div class="pub-authors">${p.authors.join(', ')}</div>
             <div class="pub-meta">
                 ${p.venue} ${p.year}
             </div>
-            <details class="pub-abstract">
-                <summary class="pub-abstract-toggle"><span class="pub-abstract-label-more">Expand abstract</span><span class="pub-abstract-label-less">Hide abstract</span></summary>
-                <div class="pub-abstract-body">${p.abstract}</div>
-            </details>
             <div class="pub-links" style="margin-top:0.5rem">
-                ${p.links && p.links.paper ? `<a href="${p.links.paper}" class="btn btn-sm btn-outline" target="_blank" style="margin-right: 0.5rem;">Paper</a>` : ''}
-                ${p.links && p.links.code ? `<a href="${p.links.code}" class="btn btn-sm btn-outline" target="_blank">Code</a>` : ''}
+                ${p.links && p.links.paper ? `<a href="${p.links.paper}" class="btn btn-sm btn-outline" target="_blank" style="margin-right: 0.5rem;">Paper</a>` : ''}${p.links && p.links.code ? `<a href="${p.links.code}" class="btn btn-sm btn-outline" target="_blank">Code</a>` : ''}
             </div>
-        </div>
-    `).join('');
+        `;
+    return el;
+}
+
+// The page pre-renders only its first data-total items; the first time a filter
+// is used, render the rest of the catalogue from the slim JSON (data-pubs-src)
+function loadCatalogue() {
+    const container = document.getElementById('pub-list');
+    const total = Number(container.dataset.total || 0);
+    if (total <= pubItems.length || !container.dataset.pubsSrc) return Promise.resolve();
+    if (!catalogueLoaded) {
+        catalogueLoaded = fetch(container.dataset.pubsSrc)
+            .then(r => r.json())
+            .then(pubs => {
+                const known = new Set(pubItems.map(el => el.dataset.id));
+                pubs.filter(p => !known.has(p.id)).forEach(p => {
+                    const el = renderPubItem(p);
+                    el.style.display = 'none';
+                    container.insertBefore(el, document.getElementById('pub-list-empty'));
+                    pubItems.push(el);
+                });
+            })
+            .catch(e => console.error('Error loading publications:', e));
+    }
+    return catalogueLoaded;
+}
+
+// Ids of publications with a term starting with every query word, or null if there is no query
+async function searchIds(q) {
+    const words = searchTokens(q);
+    if (!words.length || !searchIndex) return null;
+
+    let result = null;
+    for (const word of words) {
+        const docs = new Set();
+        for (const terms of await loadTerms(word)) {
+            for (const term in terms) {
+                if (!term.startsWith(word)) continue;
+                terms[term].forEach(([field, ...postings]) => postings.forEach(d => docs.add(d)));
+            }
+        }
+        result = result ? new Set([...result].filter(d => docs.has(d))) : docs;
+        if (!result.size) break;
+    }
+    return new Set([...result].map(d => searchIndex.docs[d]));
+}
+
+async function renderPubs() {
+    const q = document.getElementById('q').value;
+    const year = document.getElementById('year').value;
+    const filtering = Boolean(searchTokens(q).length || year);
+    if (filtering) await loadCatalogue();
+    const ids = await searchIds(q);
+
+    // A newer keystroke may have changed the query while shards loaded
+    if (q !== document.getElementById('q').value) return;
+
+    let shown = 0;
+    pubItems.forEach(el => {
+        const visible = filtering
+            ? (!ids || ids.has(el.dataset.id)) && (!year || el.dataset.year === year)
+            : pageItems.has(el);
+        el.style.display = visible ? '' : 'none';
+        if (visible) shown++;
+    });
+
+    const pager = document.getElementById('pub-pager');
+    if (pager) pager.style.display = filtering ? 'none' : '';
+
+    const container = document.getElementById('pub-list');
+    let empty = document.getElementById('pub-list-empty');
+    if (!empty) {
+        empty = document.createElement('p');
+        empty.id = 'pub-list-empty';
+        empty.textContent = 'No publications found.';
+        container.appendChild(empty);
+    }
+    empty.style.display = shown ? 'none' : '';
 }
@@ -6,6 +6,12 @@
     } catch (e) {}
 })();
 
+// Service worker registration, filled in by build.py (the markers are HTML-like
+// comments, which classic scripts ignore)
+<!-- BUILD:sw-register -->
+
+<!-- /BUILD:sw-register -->
+
 // Shared header/footer rendering
 document.addEventListener('DOMContentLoaded', () => {
     renderHeader();
@@ -17,11 +23,13 @@ function renderHeader() {
     const header = document.getElementById('site-header');
     if (!header) return;
 
+    // render.js may be served under a fingerprinted name (render.<hash>.js)
     const scripts = document.getElementsByTagName('script');
+    const renderJs = /assets\/js\/render(\.[0-9a-f]+)?\.js(\?.*)?$/;
     let basePath = '';
     for (let s of scripts) {
-        if (s.src.includes('render.js')) {
-            basePath = s.src.replace('assets/js/render.js', '');
+        if (renderJs.test(s.src)) {
+            basePath = s.src.replace(renderJs, '');
             break;
         }
     }
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+bench_build.py — Benchmark build.py against synthetic catalogues
+
+Generates publication catalogues of the requested sizes (plus scaled
+experience, projects and blog data) in temporary directories, runs
+build.main() end-to-end in a fresh process per run, and reports wall time,
+per-stage timings, peak RSS and bytes written as JSON. A cold build (empty
+tree) and a warm rebuild (nothing changed) are measured for every size.
+
+    python bench_build.py --sizes 1000 10000 --save-baseline bench-baseline.json
+    python bench_build.py --sizes 1000 10000 --baseline bench-baseline.json
+
+With --baseline, any metric that grew by more than --threshold is reported
+as a regression and the exit status is 1. No external dependencies.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Copied from the real tree into every synthetic site
+SHELL_FILES = (
+    "index.html",
+    "publications/index.html",
+    "data/config.json",
+    "data/profile.json",
+    "data/education.json",
+    "data/interests.json",
+)
+SHELL_DIRS = ("assets/css", "assets/js")
+
+PUB_TYPES = ("journal", "conference", "preprint", "thesis", "workshop")
+TAGS = (
+    "machine learning", "bioinformatics", "bacteriophage", "metagenomics",
+    "microfluidics", "pathogen screening", "deep learning", "genomics",
+    "open source", "distributed systems", "statistics", "evaluation",
+)
+FIRST_NAMES = ("Ana", "Bryce", "Chen", "Dreycey", "Élise", "Farid", "Gene", "Hana", "Ivan", "Jürgen")
+LAST_NAMES = ("Albin", "Alistar", "Balaji", "Kille", "Kochavi", "Myers", "Nasko", "Pop", "Treangen", "Øster")
+
+
+def vocabulary():
+    """Words from the real abstracts, so synthetic text tokenizes realistically."""
+    with open(os.path.join(ROOT, "data/publications.json"), encoding="utf-8") as f:
+        pubs = json.load(f)
+    words = " ".join(p.get("abstract", "") for p in pubs).split()
+    return sorted(set(words)) or ["lorem", "ipsum"]
+
+
+def synthetic_data(n_pubs, seed=0):
+    """Deterministic catalogue of n_pubs publications plus scaled side data."""
+    rng = random.Random(seed)
+    words = vocabulary()
+    text = lambda lo, hi: " ".join(rng.choice(words) for _ in range(rng.randint(lo, hi)))
+    person = lambda: f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+    pubs = []
+    for i in range(n_pubs):
+        pub = {
+            "id": f"pub-{i:06d}",
+            "title": text(6, 16).capitalize(),
+            "year": rng.randint(1995, 2025),
+            "type": rng.choice(PUB_TYPES),
+            "venue": text(1, 4).title(),
+            "authors": [person() for _ in range(rng.randint(1, 12))],
+            "tags": rng.sample(TAGS, rng.randint(1, 4)),
+            "abstract": text(120, 260),
+            "links": {"paper": f"https://example.org/papers/{i}"},
+        }
+        if rng.random() < 0.5:
+            pub["links"]["code"] = f"https://github.com/example/repo-{i}"
+        if i < 5:
+            pub["featured"] = True
+        pubs.append(pub)
+
+    experience = [
+        {
+            "company": f"Company {i // 2}",
+            "role": text(2, 4).title(),
+            "level": f"Level {60 + i % 5}",
+            "location": "Remote",
+            "period": "01/2020 – Present" if i == 0 else f"01/{2000 + i} – 12/{2001 + i}",
+            "description": text(40, 90),
+        }
+        for i in range(max(3, n_pubs // 200))
+    ]
+    projects = [
+        {
+            "name": f"Project {i}",
+            "desc": text(8, 20),
+            "href": f"https://github.com/example/project-{i}",
+            "stack": "Python / Rust",
+        }
+        for i in range(max(2, n_pubs // 100))
+    ]
+    blog = {
+        "name": "Synthetic Blog",
+        "tagline": text(5, 10),
+        "platforms": [{"name": "Substack", "icon": "bi bi-envelope-paper-fill", "url": "https://example.org"}],
+        "posts": [
+            {
+                "title": text(3, 8).title(),
+                "date": f"{rng.randint(2015, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                "url": f"https://example.org/p/{i}",
+                "platform": "substack",
+            }
+            for i in range(max(1, n_pubs // 10))
+        ],
+    }
+    return {
+        "publications.json": pubs,
+        "experience.json": experience,
+        "projects.json": projects,
+        "blog.json": blog,
+    }
+
+
+def make_site(n_pubs, seed=0):
+    """Create a temporary site tree with a synthetic catalogue; returns its path."""
+    site = tempfile.mkdtemp(prefix=f"bench-{n_pubs}-")
+    for rel in SHELL_FILES:
+        os.makedirs(os.path.dirname(os.path.join(site, rel)), exist_ok=True)
+        shutil.copy(os.path.join(ROOT, rel), os.path.join(site, rel))
+    for rel in SHELL_DIRS:
+        shutil.copytree(os.path.join(ROOT, rel), os.path.join(site, rel))
+    for name, data in synthetic_data(n_pubs, seed).items():
+        with open(os.path.join(site, "data", name), "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    return site
+
+
+def peak_rss_bytes():
+    """Peak RSS of this process and its (pool worker) children, or None."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_one(site, build_args):
+    """Child-process entry point: build site once and print the measurements."""
+    sys.path.insert(0, ROOT)
+    import build
+
+    os.chdir(site)
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            start = time.perf_counter()
+            stats = build.main(build_args)
+            wall = time.perf_counter() - start
+        finally:
+            sys.stdout = stdout
+    totals = stats["totals"]
+    print(json.dumps({
+        "wall_seconds": wall,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "bytes_written": int(totals.get("bytes_written", 0)),
+        "files_written": int(totals.get("files_written", 0)),
+        "write_seconds": totals.get("write_seconds", 0.0),
+        "inject_seconds": totals.get("inject_seconds", 0.0),
+        "stages": {name: counters["seconds"] for name, counters in stats["stages"].items()},
+    }))
+
+
+def measure(site, build_args):
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--run-one", site, "--", *build_args],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(proc.stdout)
+
+
+def flatten(result, prefix=""):
+    """{"1000.cold.stages.sitemap": seconds, ...} for baseline comparison."""
+    flat = {}
+    for key, value in result.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def compare(results, baseline, threshold, min_seconds=0.05):
+    """Metrics that grew by more than threshold relative to baseline.
+
+    Timings below min_seconds in both runs are ignored as noise.
+    """
+    current, previous = flatten(results), flatten(baseline)
+    regressions = []
+    for name, value in sorted(current.items()):
+        base = previous.get(name)
+        if not base or name.endswith("files_written"):
+            continue
+        timing = "seconds" in name or ".stages." in name
+        if timing and max(value, base) < min_seconds:
+            continue
+        if value > base * (1 + threshold):
+            regressions.append({"metric": name, "baseline": base, "current": value,
+                                "change": value / base - 1})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark build.py on synthetic catalogues.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000],
+                        help="Catalogue sizes to benchmark (e.g. 1000 10000 100000).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic data.")
+    parser.add_argument("--output", "-o", help="Write the JSON results here as well as to stdout.")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Save these results as a baseline.")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against a saved baseline.")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Relative growth that counts as a regression (default 0.15).")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated site directories.")
+    parser.add_argument("--run-one", metavar="SITE", help=argparse.SUPPRESS)
+    parser.add_argument("build_args", nargs="*",
+                        help="Extra arguments for build.py, after --, e.g. -- --jobs 4 --minify")
+    args = parser.parse_args()
+
+    if args.run_one:
+        run_one(args.run_one, args.build_args)
+        return
+
+    results = {}
+    for n in args.sizes:
+        print(f"Benchmarking {n} publications...", file=sys.stderr)
+        site = make_site(n, args.seed)
+        try:
+            results[str(n)] = {
+                "cold": measure(site, args.build_args),
+                "warm": measure(site, args.build_args),
+            }
+        finally:
+            if args.keep:
+                print(f"  site kept at {site}", file=sys.stderr)
+            else:
+                shutil.rmtree(site, ignore_errors=True)
+        cold, warm = results[str(n)]["cold"], results[str(n)]["warm"]
+        print(f"  cold {cold['wall_seconds']:.2f}s, warm {warm['wall_seconds']:.2f}s, "
+              f"{cold['bytes_written'] / 1e6:.1f} MB written", file=sys.stderr)
+
+    report = {"build_args": args.build_args, "results": results}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        report["regressions"] = compare(results, baseline["results"], args.threshold)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+
+    for r in report.get("regressions", []):
+        print(f"REGRESSION {r['metric']}: {r['baseline']:.4g} -> {r['current']:.4g} "
+              f"(+{r['change']:.0%})", file=sys.stderr)
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,19 +3,315 @@
 build.py — Static pre-rendering for dreyceyalbin.com
 
 Generates per-publication pages, injects pre-rendered content into
-index.html and publications/index.html, and regenerates sitemap.xml.
-No external dependencies — pure Python stdlib.
+index.html and publications/index.html, and regenerates the sitemaps.
+`python build.py check` checks the internal links of the built tree.
+Pure Python stdlib. Two optional packages are used when installed:
+brotli writes .br next to the .gz sidecars (--precompress), and Pillow
+(PIL) writes the downscaled image variants used in srcset (--image-widths).
 """
 
 import argparse
+import cProfile
+import difflib
+import filecmp
+import gzip
+import hashlib
+import http.server
+import io
+import itertools
 import json
 import os
+import posixpath
+import pstats
 import re
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+import unicodedata
+from collections import Counter, OrderedDict, defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import MISSING, dataclass, field, fields, replace
 from datetime import date
-from urllib.parse import quote
+from functools import cache, partial, wraps
+from html import escape
+from html.parser import HTMLParser
+from operator import attrgetter, itemgetter
+from typing import get_args, get_origin
+from urllib.parse import unquote
+
+try:  # optional: .br sidecars are only written when brotli is installed
+    import brotli
+except ImportError:
+    brotli = None
+
+try:  # optional: downscaled image variants are only written when Pillow is installed
+    from PIL import Image
+except ImportError:
+    Image = None
 
 BASE_URL = "https://www.dreyceyalbin.com"
 
+CACHE_DIR = ".build-cache"
+MANIFEST_PATH = os.path.join(CACHE_DIR, "manifest.json")
+
+# Bump whenever renderer markup changes so every cached output is re-rendered.
+TEMPLATE_VERSION = 8
+
+DATA_FILES = {
+    "profile": "data/profile.json",
+    "publications": "data/publications.json",
+    "projects": "data/projects.json",
+    "experience": "data/experience.json",
+    "education": "data/education.json",
+    "interests": "data/interests.json",
+    "blog": "data/blog.json",
+}
+
+SEARCH_INDEX_PATH = "data/search-index.json"
+SEARCH_SHARD_DIR = "data/search"
+# Indexes with more distinct terms than this are split into prefix shards.
+SEARCH_SHARD_TERMS = 5000
+
+
+# ── Build statistics ──────────────────────────────────────────────────────────
+
+class BuildStats:
+    """Wall time and counters per build stage for one run.
+
+    main() opens each stage with begin(); counters recorded while it runs
+    (files written, unchanged or skipped, bytes written, seconds spent
+    writing or injecting) are attributed to it. Calls to @timed renderers
+    are tallied separately, across stages.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.stages = {}
+        self.renderers = {}
+        self.current = None
+        self._start = None
+
+    def begin(self, name):
+        self.end()
+        self.current = name
+        self.stages.setdefault(name, defaultdict(float))
+        self._start = time.perf_counter()
+
+    def end(self):
+        if self.current is not None:
+            self.stages[self.current]["seconds"] += time.perf_counter() - self._start
+            self.current = None
+
+    def count(self, key, amount=1):
+        with self._lock:
+            self.stages.setdefault(self.current or "other", defaultdict(float))[key] += amount
+
+    def record_call(self, name, seconds, size):
+        with self._lock:
+            calls = self.renderers.setdefault(name, defaultdict(float))
+            calls["calls"] += 1
+            calls["seconds"] += seconds
+            calls["bytes"] += size
+
+    def snapshot(self):
+        """Counters and renderer calls, in a form merge() accepts."""
+        return {
+            "counters": self.totals(),
+            "renderers": {name: dict(calls) for name, calls in self.renderers.items()},
+        }
+
+    def merge(self, snapshot):
+        """Fold a snapshot from a pool worker into the current stage."""
+        for key, amount in snapshot["counters"].items():
+            self.count(key, amount)
+        with self._lock:
+            for name, calls in snapshot["renderers"].items():
+                mine = self.renderers.setdefault(name, defaultdict(float))
+                for key, amount in calls.items():
+                    mine[key] += amount
+
+    def totals(self):
+        totals = defaultdict(float)
+        for counters in self.stages.values():
+            for key, amount in counters.items():
+                totals[key] += amount
+        return dict(totals)
+
+    def as_dict(self):
+        return {
+            "stages": {name: dict(counters) for name, counters in self.stages.items()},
+            "renderers": {name: dict(calls) for name, calls in self.renderers.items()},
+            "totals": self.totals(),
+        }
+
+    def table(self):
+        """Plain-text summary of stages and renderers, for --timings."""
+        lines = [f"{'stage':<14}{'seconds':>9}{'written':>9}{'unchanged':>11}{'skipped':>9}"
+                 f"{'bytes':>12}{'write s':>9}{'inject s':>10}"]
+        for name, c in [*self.stages.items(), ("total", self.totals())]:
+            c = defaultdict(float, c)
+            lines.append(f"{name:<14}{c['seconds']:>9.3f}{int(c['files_written']):>9}"
+                         f"{int(c['files_unchanged']):>11}{int(c['files_skipped']):>9}"
+                         f"{int(c['bytes_written']):>12}{c['write_seconds']:>9.3f}{c['inject_seconds']:>10.3f}")
+        lines += ["", f"{'renderer':<30}{'calls':>8}{'seconds':>9}{'ms/call':>9}{'bytes':>12}"]
+        for name, c in sorted(self.renderers.items(), key=lambda item: -item[1]["seconds"]):
+            lines.append(f"{name:<30}{int(c['calls']):>8}{c['seconds']:>9.3f}"
+                         f"{1000 * c['seconds'] / c['calls']:>9.3f}{int(c['bytes']):>12}")
+        return "\n".join(lines)
+
+
+STATS = BuildStats()
+
+
+def timed(fn):
+    """Tally calls, wall time and output size of a renderer in STATS."""
+    name = fn.__name__
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        seconds = time.perf_counter() - start
+        text = result.html if isinstance(result, InjectResult) else result
+        STATS.record_call(name, seconds, len(text.encode("utf-8")) if isinstance(text, str) else 0)
+        return result
+
+    return wrapper
+
+
+# ── Output staging ────────────────────────────────────────────────────────────
+
+STAGING_PREFIX = "staging-"
+
+
+def _prune_empty_dirs(dirname):
+    """Remove dirname and its parents while they are empty."""
+    while dirname:
+        try:
+            os.rmdir(dirname)
+        except OSError:
+            return
+        dirname = os.path.dirname(dirname)
+
+
+class OutputWriter:
+    """Stages build outputs and moves the changed ones into place at the end.
+
+    Between begin() and commit(), write_file() and friends write into a
+    temporary directory under CACHE_DIR, keeping only files whose bytes
+    differ from the tree, and remove() just records the path. Outputs are
+    read back through source(), so later stages see earlier stages' work.
+    An interrupted build leaves the tree untouched, and commit() moves each
+    changed file into place with os.replace(). Outside a build, writes go
+    straight to the tree (still through a temporary file and os.replace()).
+    """
+
+    def __init__(self):
+        self.stage = None
+        self.removed = set()
+
+    def begin(self):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        for name in os.listdir(CACHE_DIR):  # left behind by a killed build
+            if name.startswith(STAGING_PREFIX):
+                shutil.rmtree(os.path.join(CACHE_DIR, name), ignore_errors=True)
+        self.join(tempfile.mkdtemp(prefix=STAGING_PREFIX, dir=CACHE_DIR))
+
+    def join(self, stage):
+        """Share another writer's stage directory (pool workers)."""
+        self.stage, self.removed = stage, set()
+
+    def target(self, path):
+        """Where new content for path is written."""
+        return os.path.join(self.stage, path) if self.stage else path
+
+    def source(self, path):
+        """The file holding path's current content: its staged copy, if any."""
+        if self.stage:
+            staged = os.path.join(self.stage, path)
+            if os.path.exists(staged):
+                return staged
+        return path
+
+    def exists(self, path):
+        return os.path.normpath(path) not in self.removed and os.path.exists(self.source(path))
+
+    def listdir(self, dirname):
+        """Names in dirname as they will be after commit()."""
+        names = set(os.listdir(dirname)) if os.path.isdir(dirname) else set()
+        if self.stage and os.path.isdir(os.path.join(self.stage, dirname)):
+            names.update(os.listdir(os.path.join(self.stage, dirname)))
+        return sorted(name for name in names
+                      if os.path.normpath(os.path.join(dirname, name)) not in self.removed)
+
+    def replace(self, path, tmp):
+        """Move a finished temporary file into place as path's new content."""
+        os.replace(tmp, self.target(path))
+        self.removed.discard(os.path.normpath(path))
+
+    def remove(self, path):
+        if not self.stage:
+            os.remove(path)
+            _prune_empty_dirs(os.path.dirname(path))
+            return
+        staged = os.path.join(self.stage, path)
+        if os.path.exists(staged):
+            os.remove(staged)
+        if os.path.exists(path):
+            self.removed.add(os.path.normpath(path))
+
+    def changes(self):
+        """Sorted (status, path) rows: A(dded), M(odified) or D(eleted)."""
+        rows = [("D", path) for path in self.removed]
+        for dirpath, _, filenames in os.walk(self.stage):
+            for name in filenames:
+                path = os.path.relpath(os.path.join(dirpath, name), self.stage).replace(os.sep, "/")
+                rows.append(("M" if os.path.exists(path) else "A", path))
+        return sorted(rows, key=itemgetter(1))
+
+    def diff(self, status, path):
+        """Unified diff of path's staged change, as a str."""
+        def lines(file):
+            with open(file, "rb") as f:
+                return f.read().decode("utf-8").splitlines(keepends=True)
+        try:
+            old = lines(path) if status != "A" else []
+            new = lines(os.path.join(self.stage, path)) if status != "D" else []
+        except UnicodeDecodeError:
+            return f"Binary files a/{path} and b/{path} differ\n"
+        diff = difflib.unified_diff(
+            old, new, "/dev/null" if status == "A" else f"a/{path}", "/dev/null" if status == "D" else f"b/{path}")
+        return "".join(line if line.endswith("\n") else line + "\n\\ No newline at end of file\n" for line in diff)
+
+    def commit(self):
+        """Move every staged file into place and apply removals; returns changes()."""
+        rows = self.changes()
+        for status, path in rows:
+            if status == "D":
+                if os.path.exists(path):
+                    os.remove(path)
+                _prune_empty_dirs(os.path.dirname(path))
+                continue
+            dirname = os.path.dirname(path)
+            if dirname:
+                os.makedirs(dirname, exist_ok=True)
+            os.replace(os.path.join(self.stage, path), path)
+        self.discard()
+        return rows
+
+    def discard(self):
+        if self.stage:
+            shutil.rmtree(self.stage, ignore_errors=True)
+        self.join(None)
+
+
+WRITER = OutputWriter()
+
 
 # ── I/O helpers ───────────────────────────────────────────────────────────────
 
@@ -25,356 +321,1404 @@ def load_json(path):
 
 
 def read_file(path):
-    with open(path, encoding="utf-8") as f:
+    with open(WRITER.source(path), encoding="utf-8") as f:
+        return f.read()
+
+
+def read_bytes(path):
+    with open(WRITER.source(path), "rb") as f:
         return f.read()
 
 
 def write_file(path, content):
-    dirname = os.path.dirname(path)
+    """Write content to path unless the bytes on disk already match.
+
+    Returns True if the file was written, False if it was left untouched.
+    """
+    return write_bytes(path, content.encode("utf-8"))
+
+
+def write_bytes(path, data):
+    """write_file() for raw bytes."""
+    start = time.perf_counter()
+    try:
+        if read_bytes(path) == data:
+            STATS.count("files_unchanged")
+            STATS.count("write_seconds", time.perf_counter() - start)
+            return False
+    except FileNotFoundError:
+        pass
+    tmp = WRITER.target(path) + ".tmp"
+    dirname = os.path.dirname(tmp)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
+    with open(tmp, "wb") as f:
+        f.write(data)
+    WRITER.replace(path, tmp)
+    STATS.count("files_written")
+    STATS.count("bytes_written", len(data))
+    STATS.count("write_seconds", time.perf_counter() - start)
+    return True
+
+
+def write_stream(path, chunks):
+    """write_file() for an iterable of str chunks, streamed to disk.
+
+    Chunks go to a temporary file, which replaces path only if it differs.
+    """
+    start = time.perf_counter()
+    tmp = WRITER.target(path) + ".tmp"
+    dirname = os.path.dirname(tmp)
     if dirname:
         os.makedirs(dirname, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(content)
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        f.writelines(chunks)
+    source = WRITER.source(path)
+    if os.path.exists(source) and filecmp.cmp(tmp, source, shallow=False):
+        os.remove(tmp)
+        STATS.count("files_unchanged")
+        STATS.count("write_seconds", time.perf_counter() - start)
+        return False
+    STATS.count("bytes_written", os.path.getsize(tmp))
+    WRITER.replace(path, tmp)
+    STATS.count("files_written")
+    STATS.count("write_seconds", time.perf_counter() - start)
+    return True
 
 
-def inject_build_block(html, name, replacement):
-    """Replace <!-- BUILD:name --> ... <!-- /BUILD:name --> with new content."""
-    pattern = rf'<!-- BUILD:{re.escape(name)} -->.*?<!-- /BUILD:{re.escape(name)} -->'
-    new_block = f'<!-- BUILD:{name} -->\n{replacement}\n<!-- /BUILD:{name} -->'
-    result, count = re.subn(pattern, new_block, html, flags=re.DOTALL)
-    if count == 0:
-        print(f"  WARNING: BUILD:{name} marker not found")
-    return result
+def compact_json(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
 
 
-# ── Home page section renderers ───────────────────────────────────────────────
+def hashed_name(stem, ext, content):
+    """Content-addressed file name, e.g. data.3f2a9c01d4.json."""
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:10]
+    return f"{stem}.{digest}.{ext}"
 
-def render_about_section(profile, education, interests, publish_resume=False):
-    links_html = '\n'.join(
-        f'                <a href="{l["href"]}" target="_blank" title="{l["label"]}"'
-        f' style="color: var(--accent-color); font-size: 1.5rem; text-decoration: none;'
-        f' transition: transform 0.2s; display: inline-flex; justify-content: center;'
-        f' align-items: center; width: 40px; height: 40px; border-radius: 50%; background: #f8f9fa;">'
-        f'\n                    <i class="{l["icon"]}"></i>\n                </a>'
-        for l in profile['links']
+
+def remove_stale_hashed(dirname, stem, ext, keep):
+    """Delete earlier content-hashed copies of stem.*.ext in dirname, except keep.
+
+    Precompressed sidecars of the deleted copies go with them.
+    """
+    pattern = re.compile(rf'{re.escape(stem)}\.[0-9a-f]{{10}}\.{re.escape(ext)}')
+    for name in WRITER.listdir(dirname):
+        if sidecar_source(name) != keep and pattern.fullmatch(sidecar_source(name)):
+            WRITER.remove(os.path.join(dirname, name))
+
+
+SIDECAR_SUFFIXES = (".gz", ".br")
+
+
+def sidecar_source(path):
+    """The output a precompressed sidecar belongs to (path itself if not a sidecar)."""
+    for suffix in SIDECAR_SUFFIXES:
+        if path.endswith(suffix):
+            return path[:-len(suffix)]
+    return path
+
+
+def remove_output(path):
+    """Remove path and its precompressed sidecars, where they exist."""
+    for name in (path, *(path + suffix for suffix in SIDECAR_SUFFIXES)):
+        if WRITER.exists(name):
+            WRITER.remove(name)
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(WRITER.source(path), "rb") as f:
+        for block in iter(partial(f.read, 1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+FILE_HASHES_PATH = os.path.join(CACHE_DIR, "file-hashes.json")
+
+
+class FileHashes:
+    """file_hash() memoized on each file's mtime and size, like Watcher.
+
+    Staged files keep their mtime when commit() moves them into place, so
+    outputs written by one build are not re-read by the next. Saved to
+    FILE_HASHES_PATH between builds and loaded on first use.
+    """
+
+    def __init__(self, path=FILE_HASHES_PATH):
+        self.path = path
+        self.entries = None
+        self.dirty = False
+
+    def get(self, path):
+        """file_hash(path); raises FileNotFoundError if path does not exist."""
+        if self.entries is None:
+            try:
+                self.entries = load_json(self.path)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self.entries = {}
+        st = os.stat(WRITER.source(path))
+        entry = self.entries.get(path)
+        if entry and entry[:2] == [st.st_mtime_ns, st.st_size]:
+            return entry[2]
+        digest = file_hash(path)
+        self.entries[path] = [st.st_mtime_ns, st.st_size, digest]
+        self.dirty = True
+        return digest
+
+    def clear(self):
+        self.entries, self.dirty = {}, True
+
+    def save(self):
+        if self.dirty:
+            write_file(self.path, compact_json({path: entry for path, entry in sorted(self.entries.items())
+                                                if os.path.exists(path)}))
+            self.dirty = False
+
+
+FILE_HASHES = FileHashes()
+
+
+BUILD_MARKER_RE = re.compile(r'<!-- (/?)BUILD:([^\s>]+) -->')
+
+InjectResult = namedtuple("InjectResult", "html missing duplicates")
+
+
+@timed
+def inject_build_blocks(html, replacements):
+    """Replace each <!-- BUILD:name --> ... <!-- /BUILD:name --> block in one pass.
+
+    replacements maps block name -> new content. Markers are tokenized once
+    and the document is rebuilt with a single join. Returns an InjectResult
+    whose missing/duplicates list the names that were not found or that
+    matched more than one block (every match is replaced).
+    """
+    counts = dict.fromkeys(replacements, 0)
+    parts = []
+    pos = 0
+    open_name = open_start = None
+    for m in BUILD_MARKER_RE.finditer(html):
+        closing, name = m.group(1), m.group(2)
+        if name not in counts:
+            continue
+        if open_name is None:
+            if not closing:
+                open_name, open_start = name, m.start()
+        elif closing and name == open_name:
+            parts.append(html[pos:open_start])
+            parts.append(f'<!-- BUILD:{name} -->\n{replacements[name]}\n<!-- /BUILD:{name} -->')
+            pos = m.end()
+            counts[name] += 1
+            open_name = None
+    parts.append(html[pos:])
+    return InjectResult(
+        ''.join(parts),
+        [name for name, n in counts.items() if n == 0],
+        [name for name, n in counts.items() if n > 1],
     )
 
-    edu_parts = []
-    for edu in education:
-        details_html = (
-            f' &middot; <span style="font-family: var(--font-mono); color: var(--code-accent); font-size: 0.7rem;">{edu["details"]}</span>'
-            if edu.get('details') else ''
-        )
-        edu_parts.append(
-            '        <div style="margin-bottom: 0.875rem; border-left: 1px solid var(--border-color); padding-left: 0.75rem;">'
-            f'\n            <div style="font-size: 0.875rem; font-weight: 500; color: var(--text-color); line-height: 1.35;">{edu["degree"]}</div>'
-            f'\n            <div style="font-size: 0.8rem; color: var(--text-muted);">{edu["school"]}{details_html}</div>'
-            f'\n            <div style="font-family: var(--font-mono); font-size: 0.7rem; color: var(--text-muted); margin-top: 0.1rem;">{edu["year"]}</div>'
-            '\n        </div>'
-        )
-    edu_html = '\n'.join(edu_parts)
-
-    interests_parts = []
-    for cat in interests:
-        badges = ''.join(f'<span class="badge">{item}</span>' for item in cat['items'])
-        interests_parts.append(
-            f'        <div style="margin-bottom: 0.875rem;">'
-            f'\n            <div class="interests-container">{badges}</div>'
-            '\n        </div>'
-        )
-    interests_html = '\n'.join(interests_parts)
 
-    return f'''<section id="about" data-publish-resume="{'true' if publish_resume else 'false'}">
+def split_build_block(path, name):
+    """(prefix, suffix) of the file at path around its BUILD:name block.
+
+    The file is read line by line and the old block is never held in memory.
+    prefix ends with the opening marker and suffix starts with the closing
+    one, exactly as inject_build_blocks() writes them. Returns None unless
+    there is exactly one such block.
+    """
+    opening, closing = f"<!-- BUILD:{name} -->", f"<!-- /BUILD:{name} -->"
+    prefix, suffix = [], []
+    state = "prefix"
+    with open(WRITER.source(path), encoding="utf-8", newline="") as f:
+        for line in f:
+            if state == "prefix":
+                at = line.find(opening)
+                if at < 0:
+                    prefix.append(line)
+                    continue
+                prefix.append(line[:at] + opening + "\n")
+                line, state = line[at + len(opening):], "block"
+            if state == "block":
+                at = line.find(closing)
+                if at >= 0:
+                    suffix.append("\n" + line[at:])
+                    state = "suffix"
+            elif opening in line:
+                return None
+            else:
+                suffix.append(line)
+    return ("".join(prefix), "".join(suffix)) if state == "suffix" else None
+
+
+def warn_injection(path, result):
+    for name in result.missing:
+        print(f"  WARNING: {path}: BUILD:{name} marker not found")
+    for name in result.duplicates:
+        print(f"  WARNING: {path}: BUILD:{name} marker found more than once")
+
+
+def inject_into(path, html, replacements):
+    """inject_build_blocks() plus warnings for path; returns the new html."""
+    start = time.perf_counter()
+    result = inject_build_blocks(html, replacements)
+    STATS.count("inject_seconds", time.perf_counter() - start)
+    warn_injection(path, result)
+    return result.html
+
+
+# ── Incremental build manifest ────────────────────────────────────────────────
+
+def content_hash(*parts):
+    """Stable SHA-256 over any JSON-serialisable inputs."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=to_json)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class BuildManifest:
+    """Persistent map of output path -> hash of the inputs it was rendered from.
+
+    It also remembers, per sitemap URL, a hash of the content behind it and
+    the date that hash last changed. That history survives template version
+    bumps and --force, so lastmod only moves when content does.
+    """
+
+    def __init__(self, path=MANIFEST_PATH, entries=None, lastmods=None):
+        self.path = path
+        self.entries = entries or {}
+        self.lastmods = lastmods or {}
+        # Outputs checked or recorded by this build, for save(prune=True)
+        self.seen = set()
+
+    @classmethod
+    def load(cls, path=MANIFEST_PATH):
+        try:
+            data = load_json(path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return cls(path)
+        lastmods = data.get("lastmod", {})
+        if data.get("template_version") != TEMPLATE_VERSION:
+            return cls(path, lastmods=lastmods)
+        return cls(path, data.get("outputs", {}), lastmods)
+
+    def is_fresh(self, output, key):
+        self.seen.add(output)
+        fresh = self.entries.get(output) == key and WRITER.exists(output)
+        if fresh:
+            STATS.count("files_skipped")
+        return fresh
+
+    def record(self, output, key):
+        self.seen.add(output)
+        self.entries[output] = key
+
+    def lastmod(self, url, key, today):
+        """Date url's content last changed: kept while key matches, else today."""
+        entry = self.lastmods.get(url)
+        if entry is None or entry[0] != key:
+            entry = self.lastmods[url] = [key, today]
+        return entry[1]
+
+    def prune_lastmods(self, urls):
+        self.lastmods = {url: entry for url, entry in self.lastmods.items() if url in urls}
+
+    def save(self, prune=False):
+        """Write the manifest; with prune, drop outputs this build never looked at.
+
+        Only a full build sees every output, so partial builds keep the rest.
+        The lastmod history is pruned separately, by prune_lastmods().
+        """
+        if prune:
+            self.entries = {output: key for output, key in self.entries.items() if output in self.seen}
+        write_file(self.path, json.dumps(
+            {"template_version": TEMPLATE_VERSION, "outputs": self.entries, "lastmod": self.lastmods},
+            indent=2, sort_keys=True,
+        ) + "\n")
+
+
+def build_output(manifest, path, key, render):
+    """Render and write path unless the manifest says its inputs are unchanged.
+
+    render returns the page as a str, or as an iterable of str chunks to
+    stream to disk. Returns "skipped" (inputs unchanged), "unchanged"
+    (re-rendered to identical bytes) or "written".
+    """
+    if manifest.is_fresh(path, key):
+        return "skipped"
+    content = render()
+    written = write_file(path, content) if isinstance(content, str) else write_stream(path, content)
+    manifest.record(path, key)
+    return "written" if written else "unchanged"
+
+
+def build_in_place(manifest, path, inputs, render):
+    """Like build_output, for page shells that are rewritten in place.
+
+    The shell is both input and output, so the recorded key covers the
+    rendered result: an untouched shell with unchanged inputs is skipped,
+    while a hand edit to the shell forces a re-render.
+    """
+    shell = read_file(path)
+    if manifest.is_fresh(path, content_hash(inputs, shell)):
+        return "skipped"
+    html = render(shell)
+    written = write_file(path, html)
+    manifest.record(path, content_hash(inputs, html))
+    return "written" if written else "unchanged"
+
+
+def stream_in_place(manifest, path, inputs, name, render, finish, blocks=None):
+    """build_in_place() for a shell whose BUILD:name block is streamed.
+
+    Only the shell around the block is held in memory: the old block is
+    skipped while reading, and render()'s chunks go straight to disk.
+    blocks are other (small) replacements for the text around it, which
+    finish then post-processes. Returns None, without writing, if the shell
+    lacks a single BUILD:name block.
+    """
+    if manifest.is_fresh(path, content_hash(inputs, file_hash(path))):
+        return "skipped"
+    parts = split_build_block(path, name)
+    if parts is None:
+        return None
+    prefix, suffix = parts
+    if blocks:
+        before, after = inject_build_blocks(prefix, blocks), inject_build_blocks(suffix, blocks)
+        warn_injection(path, InjectResult(
+            None, [n for n in before.missing if n in after.missing], before.duplicates + after.duplicates))
+        prefix, suffix = before.html, after.html
+    written = write_stream(path, itertools.chain([finish(prefix)], render(), [finish(suffix)]))
+    manifest.record(path, content_hash(inputs, file_hash(path)))
+    return "written" if written else "unchanged"
+
+
+def _pool_call(fn, stage, item):
+    """Run fn(item) in a pool worker, staging into the parent's stage directory,
+    and hand its counters and removals back to the parent."""
+    STATS.reset()
+    WRITER.join(stage)
+    result = fn(item)
+    return result, STATS.snapshot(), WRITER.removed
+
+
+def map_jobs(fn, items, jobs=1):
+    """map() over items, on a process pool when jobs > 1. Results keep input order.
+
+    Counters recorded by workers are merged into the parent's current stage.
+    """
+    if jobs <= 1 or len(items) < 2:
+        return [fn(item) for item in items]
+    chunksize = max(1, len(items) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        results = []
+        for result, snapshot, removed in pool.map(partial(_pool_call, fn, WRITER.stage), items, chunksize=chunksize):
+            STATS.merge(snapshot)
+            WRITER.removed |= removed
+            results.append(result)
+        return results
+
+
+def report(path, status):
+    print(f"  -> {path}" if status == "written" else f"  -- {path} ({status})")
+
+
+# ── Data model ────────────────────────────────────────────────────────────────
+
+class DataError(ValueError):
+    """A data file that does not match the data model.
+
+    where locates the bad value, e.g. data/publications.json[3].links.paper;
+    converters raise with a relative where that callers extend on the way up.
+    """
+
+    def __init__(self, reason, where=''):
+        super().__init__(f"{where}: {reason}" if where else reason)
+        self.reason, self.where = reason, where
+
+    def within(self, prefix):
+        return DataError(self.reason, prefix + self.where)
+
+
+_JSON_TYPE_NAMES = {str: "string", int: "integer", float: "number", bool: "boolean",
+                    list: "array", dict: "object", type(None): "null"}
+_PUB_ID_RE = re.compile(r'[A-Za-z0-9][\w.-]*')
+
+
+def _expect(value, kind):
+    # Exact class check: JSON booleans must not pass as integers
+    if value.__class__ is not kind:
+        got = _JSON_TYPE_NAMES.get(value.__class__, value.__class__.__name__)
+        raise DataError(f"expected {_JSON_TYPE_NAMES[kind]}, got {got}")
+    return value
+
+
+@cache
+def converter(kind):
+    """Function checking a JSON value against an annotated type and converting it.
+
+    kind is a Record subclass, tuple[X, ...] (a JSON array), dict[str, X] or
+    a scalar type. Built once per type, so loading does no type dispatch.
+    """
+    origin = get_origin(kind)
+    if origin is tuple:
+        item = get_args(kind)[0]
+        if item in _JSON_TYPE_NAMES:
+            def convert(value):
+                if _expect(value, list) and not all(v.__class__ is item for v in value):
+                    for i, v in enumerate(value):
+                        try:
+                            _expect(v, item)
+                        except DataError as e:
+                            raise e.within(f"[{i}]") from None
+                return tuple(value)
+            return convert
+        item_convert = converter(item)
+
+        def convert(value):
+            items = []
+            for i, v in enumerate(_expect(value, list)):
+                try:
+                    items.append(item_convert(v))
+                except DataError as e:
+                    raise e.within(f"[{i}]") from None
+            return tuple(items)
+        return convert
+    if origin is dict:
+        item = get_args(kind)[1]
+
+        def convert(value):
+            for k, v in _expect(value, dict).items():
+                try:
+                    _expect(v, item)
+                except DataError as e:
+                    raise e.within(f".{k}") from None
+            return value
+        return convert
+    if issubclass(kind, Record):
+        return kind.from_json
+    return partial(_expect, kind=kind)
+
+
+def from_json(kind, value, where):
+    """converter(kind)(value), with where prefixed to any error location."""
+    try:
+        return converter(kind)(value)
+    except DataError as e:
+        raise e.within(where) from None
+
+
+def to_json(value):
+    """Records (and containers of them) back to plain JSON values."""
+    if isinstance(value, Record):
+        return value.to_json()
+    if isinstance(value, (tuple, list)):
+        return [to_json(v) for v in value]
+    return value
+
+
+@cache
+def record_fields(cls):
+    """(name, converter, required, holds records) for each JSON field of cls, in file order."""
+    spec = []
+    for f in fields(cls):
+        if f.init:
+            nested = any(isinstance(t, type) and issubclass(t, Record) for t in (f.type, *get_args(f.type)))
+            spec.append((f.name, converter(f.type), f.default is MISSING and f.default_factory is MISSING, nested))
+    return tuple(spec)
+
+
+class Record:
+    """Base of the data model's dataclasses.
+
+    Fields read from JSON are declared in file order; those with a default
+    are optional and normalized to it when absent. Derived values are
+    init=False fields set by __post_init__. Records are not modified after
+    loading, and support item access so a Template can render one directly.
+    """
+
+    # Optional fields absent from the file, which to_json() leaves out again,
+    # and the memoized digest()
+    __slots__ = ("_absent", "_digest")
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    @classmethod
+    def from_json(cls, value):
+        _expect(value, dict)
+        kwargs, absent = {}, []
+        for name, convert, required, _ in record_fields(cls):
+            if name in value:
+                try:
+                    kwargs[name] = convert(value[name])
+                except DataError as e:
+                    raise e.within(f".{name}") from None
+            elif required:
+                raise DataError(f"missing required field {name!r}")
+            else:
+                absent.append(name)
+        if len(kwargs) < len(value):
+            unknown = value.keys() - kwargs.keys()
+            raise DataError(f"unknown field {min(unknown)!r}")
+        record = cls(**kwargs)
+        record._absent = frozenset(absent)
+        return record
+
+    def digest(self):
+        """Short stable hash of to_json(), computed once."""
+        try:
+            return self._digest
+        except AttributeError:
+            self._digest = content_hash(self.to_json())[:16]
+            return self._digest
+
+    def to_json(self):
+        """The record as it appears in the data file (field order, absent optionals left out)."""
+        absent = getattr(self, "_absent", ())
+        return {
+            name: to_json(getattr(self, name)) if nested else getattr(self, name)
+            for name, _, _, nested in record_fields(type(self)) if name not in absent
+        }
+
+
+@dataclass(slots=True, kw_only=True)
+class Link(Record):
+    label: str
+    href: str
+    icon: str = ''
+
+
+@dataclass(slots=True, kw_only=True)
+class Profile(Record):
+    name: str
+    role: str
+    org: str
+    location: str = ''
+    bio: str = ''
+    links: tuple[Link, ...] = ()
+
+
+@dataclass(slots=True, kw_only=True)
+class Education(Record):
+    degree: str
+    school: str
+    year: str = ''
+    details: str = ''
+
+
+@dataclass(slots=True, kw_only=True)
+class InterestGroup(Record):
+    category: str
+    items: tuple[str, ...] = ()
+
+
+@dataclass(slots=True, kw_only=True)
+class Experience(Record):
+    company: str
+    role: str
+    level: str = ''
+    location: str = ''
+    period: str
+    description: str = ''
+    details: tuple[str, ...] = ()
+    current: bool = field(init=False)
+
+    def __post_init__(self):
+        self.current = 'present' in self.period.lower()
+
+
+@dataclass(slots=True, kw_only=True)
+class Project(Record):
+    name: str
+    desc: str = ''
+    href: str
+    stack: str = ''
+    image: str = ''
+
+
+@dataclass(slots=True, kw_only=True)
+class Publication(Record):
+    id: str
+    title: str
+    year: int
+    type: str
+    venue: str = ''
+    authors: tuple[str, ...]
+    tags: tuple[str, ...] = ()
+    abstract: str = ''
+    links: dict[str, str] = field(default_factory=dict)
+    featured: bool = False
+    authors_text: str = field(init=False)
+    author_slugs: tuple[str, ...] = field(init=False)
+    tag_slugs: tuple[str, ...] = field(init=False)
+
+    def __post_init__(self):
+        self.authors_text = ', '.join(self.authors)
+        self.author_slugs = tuple(map(name_slug, self.authors))
+        self.tag_slugs = tuple(map(name_slug, self.tags))
+
+
+@dataclass(slots=True, kw_only=True)
+class Platform(Record):
+    name: str
+    icon: str = ''
+    url: str
+    featured_video_id: str = ''
+
+
+@dataclass(slots=True, kw_only=True)
+class Post(Record):
+    title: str
+    date: str
+    url: str
+    platform: str = ''
+
+
+@dataclass(slots=True, kw_only=True)
+class Blog(Record):
+    name: str = 'Blog'
+    tagline: str = ''
+    platforms: tuple[Platform, ...] = ()
+    posts: tuple[Post, ...] = ()
+    recent_posts: tuple[Post, ...] = field(init=False)
+
+    def __post_init__(self):
+        self.recent_posts = tuple(sorted(self.posts, key=attrgetter('date'), reverse=True))
+
+
+# The type each DATA_FILES entry is validated against
+DATA_MODEL = {
+    "profile": Profile,
+    "publications": tuple[Publication, ...],
+    "projects": tuple[Project, ...],
+    "experience": tuple[Experience, ...],
+    "education": tuple[Education, ...],
+    "interests": tuple[InterestGroup, ...],
+    "blog": Blog,
+}
+
+
+@dataclass(slots=True)
+class SiteData:
+    """Every data file, validated, plus values derived from the catalogue."""
+
+    profile: Profile
+    publications: tuple[Publication, ...]
+    projects: tuple[Project, ...]
+    experience: tuple[Experience, ...]
+    education: tuple[Education, ...]
+    interests: tuple[InterestGroup, ...]
+    blog: Blog
+    sorted_pubs: list = field(init=False)
+    featured_pubs: list = field(init=False)
+
+    def __post_init__(self):
+        seen = {}
+        for i, pub in enumerate(self.publications):
+            where = f"{DATA_FILES['publications']}[{i}].id"
+            if not _PUB_ID_RE.fullmatch(pub.id):
+                raise DataError(f"{pub.id!r} is not usable as a directory name", where)
+            if pub.id in LISTING_KINDS:
+                raise DataError(f"{pub.id!r} is reserved for the publications/{pub.id}/ listings", where)
+            if pub.id in seen:
+                raise DataError(f"duplicate id {pub.id!r} (first used at [{seen[pub.id]}])", where)
+            seen[pub.id] = i
+        self.sorted_pubs = sort_pubs(self.publications)
+        self.featured_pubs = [p for p in self.publications if p.featured]
+
+
+def load_data_file(name):
+    """Load and validate DATA_FILES[name]; raises DataError."""
+    path = DATA_FILES[name]
+    try:
+        raw = load_json(path)
+    except FileNotFoundError:
+        raise DataError("file not found", path) from None
+    except json.JSONDecodeError as e:
+        raise DataError(f"invalid JSON: {e.msg}", f"{path}:{e.lineno}:{e.colno}") from None
+    return from_json(DATA_MODEL[name], raw, path)
+
+
+# ── Templates ─────────────────────────────────────────────────────────────────
+
+_SLOT_RE = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+# Every Template ever constructed, for passes that inspect renderer markup
+TEMPLATES = []
+
+
+class Template:
+    """HTML template parsed once into static chunks and slot callables.
+
+    Slots are written {{name}} and filled from a mapping at render time, so
+    the markup is scanned once at import and every render is a single join.
+    """
+
+    __slots__ = ("chunks",)
+
+    def __init__(self, source):
+        chunks = []
+        pos = 0
+        for m in _SLOT_RE.finditer(source):
+            if m.start() > pos:
+                chunks.append(source[pos:m.start()])
+            chunks.append(itemgetter(m.group(1)))
+            pos = m.end()
+        if pos < len(source):
+            chunks.append(source[pos:])
+        self.chunks = tuple(chunks)
+        TEMPLATES.append(self)
+
+    def render(self, ctx):
+        return ''.join([c if c.__class__ is str else str(c(ctx)) for c in self.chunks])
+
+
+def render_each(template, rows, sep=''):
+    return sep.join([template.render(row) for row in rows])
+
+
+# ── Fragment cache ────────────────────────────────────────────────────────────
+
+FRAGMENT_CACHE_PATH = os.path.join(CACHE_DIR, "fragments.json")
+FRAGMENT_CACHE_MB = 64
+
+
+class FragmentCache:
+    """Rendered fragments by key, least recently used first.
+
+    Held in memory for the whole build (and across --watch rebuilds) and
+    saved to FRAGMENT_CACHE_PATH between builds. The saved cache is only
+    read on the first lookup, so builds that render nothing never load it.
+    Once the keys and HTML add up to more than max_bytes characters, the
+    least recently used entries are evicted.
+    """
+
+    def __init__(self, path=FRAGMENT_CACHE_PATH, max_bytes=FRAGMENT_CACHE_MB << 20):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.loaded = False
+        self.dirty = False
+
+    def load(self):
+        self.loaded = True
+        try:
+            entries = load_json(self.path)["entries"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return
+        for key, html in entries:
+            self.put(key, html)
+        self.dirty = False
+
+    def clear(self):
+        """Forget every fragment, including the saved ones."""
+        self.entries.clear()
+        self.size = 0
+        self.loaded = self.dirty = True
+
+    def get(self, key):
+        if not self.loaded:
+            self.load()
+        self.dirty = True  # a hit reorders, a miss is followed by put()
+        html = self.entries.get(key)
+        if html is None:
+            STATS.count("fragment_misses")
+            return None
+        self.entries.move_to_end(key)
+        STATS.count("fragment_hits")
+        return html
+
+    def put(self, key, html):
+        if key in self.entries:
+            self.size -= len(key) + len(self.entries.pop(key))
+        self.entries[key] = html
+        self.size += len(key) + len(html)
+        while self.size > self.max_bytes:
+            old_key, old = self.entries.popitem(last=False)
+            self.size -= len(old_key) + len(old)
+
+    def save(self):
+        if self.dirty:
+            write_file(self.path, compact_json({"entries": list(self.entries.items())}))
+            self.dirty = False
+
+
+FRAGMENTS = FragmentCache()
+
+
+def fragment_part(value):
+    """Stable, short key component for a renderer argument."""
+    if isinstance(value, Record):
+        return value.digest()
+    if isinstance(value, (tuple, list)):
+        return content_hash([fragment_part(v) for v in value])[:16]
+    return repr(value)
+
+
+def fragment(fn):
+    """Memoize a renderer in FRAGMENTS.
+
+    The key is the renderer's name, TEMPLATE_VERSION and a digest of each
+    argument, so a fragment renders once per build for the same inputs and
+    later builds reuse it until its inputs or the markup version change.
+    """
+    prefix = f"{fn.__name__}:{TEMPLATE_VERSION}:"
+
+    @wraps(fn)
+    def wrapper(*args):
+        key = prefix + ":".join(map(fragment_part, args))
+        html = FRAGMENTS.get(key)
+        if html is None:
+            html = fn(*args)
+            FRAGMENTS.put(key, html)
+        return html
+
+    return wrapper
+
+
+# ── Responsive images ─────────────────────────────────────────────────────────
+
+PROFILE_IMAGES = ("assets/img/me.jpg", "assets/img/me_light.png")
+IMAGE_WIDTHS = (320, 640, 960)
+# Rendered widths, for sizes="": the about photo column, and project cards
+# (two grid columns up to 1200px, three above; hidden on phones). Must match main.js
+PROFILE_IMAGE_SIZES = "300px"
+PROJECT_IMAGE_SIZES = "(max-width: 1200px) 50vw, 33vw"
+# Formats Pillow re-encodes at a smaller size; others only get width/height
+_RESIZABLE_FORMATS = {"png": "PNG", "jpg": "JPEG", "jpeg": "JPEG", "webp": "WEBP"}
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+ImageInfo = namedtuple("ImageInfo", "width height srcset")
+
+
+def image_size(path):
+    """(width, height) of a PNG, GIF, WebP or JPEG image from its header, or None."""
+    with open(WRITER.source(path), "rb") as f:
+        head = f.read(30)
+        if head.startswith(b"\x89PNG\r\n\x1a\n"):
+            return int.from_bytes(head[16:20], "big"), int.from_bytes(head[20:24], "big")
+        if head[:6] in (b"GIF87a", b"GIF89a"):
+            return int.from_bytes(head[6:8], "little"), int.from_bytes(head[8:10], "little")
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            if head[12:16] == b"VP8 ":
+                return int.from_bytes(head[26:28], "little") & 0x3FFF, int.from_bytes(head[28:30], "little") & 0x3FFF
+            if head[12:16] == b"VP8L":
+                bits = int.from_bytes(head[21:25], "little")
+                return (bits & 0x3FFF) + 1, (bits >> 14 & 0x3FFF) + 1
+            if head[12:16] == b"VP8X":
+                return int.from_bytes(head[24:27], "little") + 1, int.from_bytes(head[27:30], "little") + 1
+            return None
+        if head[:2] != b"\xff\xd8":
+            return None
+        pos = 2  # walk the JPEG segments up to the frame header
+        while True:
+            f.seek(pos)
+            segment = f.read(9)
+            if len(segment) < 9 or segment[0] != 0xFF:
+                return None
+            if segment[1] in _JPEG_SOF_MARKERS:
+                return int.from_bytes(segment[7:9], "big"), int.from_bytes(segment[5:7], "big")
+            pos += 2 + int.from_bytes(segment[2:4], "big")
+
+
+def image_variant_path(path, width, digest):
+    """Downscaled copy of path, named after the source's hash: me-640w.3f2a9c01d4.jpg."""
+    stem, ext = path.rsplit(".", 1)
+    return f"{stem}-{width}w.{digest[:10]}.{ext}"
+
+
+def resize_image(path, width):
+    """path's image scaled to width pixels wide, encoded in its own format."""
+    with Image.open(WRITER.source(path)) as im:
+        fmt = im.format
+        if im.mode in ("1", "P"):  # palette images only resize by nearest neighbour
+            im = im.convert("RGBA")
+        resized = im.resize((width, max(1, round(im.height * width / im.width))), Image.LANCZOS)
+    out = io.BytesIO()
+    if fmt == "JPEG":
+        resized.save(out, fmt, quality=85, optimize=True, progressive=True)
+    else:
+        resized.save(out, fmt, optimize=True)
+    return out.getvalue()
+
+
+def responsive_images(paths, widths):
+    """ImageInfo for each local image in paths, writing its downscaled variants.
+
+    Variants are named after their source's hash, so an unchanged image is
+    not decoded again, and one that changed gets new names. Without Pillow
+    only variants already on disk are used; the rest are skipped and the
+    image gets width/height alone. Returns (images, variant paths, skipped).
+    """
+    images = {}
+    variants = []
+    skipped = 0
+    for path in dict.fromkeys(paths):
+        if not path or "//" in path or not WRITER.exists(path):
+            continue
+        size = image_size(path)
+        if size is None:
+            continue
+        width, height = size
+        digest = FILE_HASHES.get(path)
+        stem, ext = path.rsplit(".", 1)
+        srcset = []
+        if ext.lower() in _RESIZABLE_FORMATS:
+            for w in sorted(w for w in widths if w < width):
+                variant = image_variant_path(path, w, digest)
+                if not WRITER.exists(variant):
+                    if Image is None:
+                        skipped += 1
+                        continue
+                    write_bytes(variant, resize_image(path, w))
+                srcset.append(f"{variant} {w}w")
+                variants.append(variant)
+        images[path] = ImageInfo(width, height, ", ".join(srcset + [f"{path} {width}w"]) if srcset else "")
+        dirname, name = os.path.split(stem)
+        pattern = re.compile(rf'{re.escape(name)}-\d+w\.[0-9a-f]{{10}}\.{re.escape(ext)}')
+        for old in WRITER.listdir(dirname):
+            if pattern.fullmatch(sidecar_source(old)) and f"{dirname}/{sidecar_source(old)}" not in variants:
+                WRITER.remove(f"{dirname}/{old}")
+    return images, variants, skipped
+
+
+def image_widths(text):
+    """Parse --image-widths: comma-separated pixel widths."""
+    try:
+        return tuple(sorted({int(w) for w in text.split(",") if w.strip()}))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated widths, got {text!r}")
+
+
+def image_attrs(info, sizes):
+    """width/height attributes for an <img>, plus srcset/sizes when it has variants."""
+    if info is None:
+        return ''
+    attrs = f' width="{info.width}" height="{info.height}"'
+    if info.srcset:
+        attrs += f' srcset="{info.srcset}" sizes="{sizes}"'
+    return attrs
+
+
+# ── Home page section renderers ───────────────────────────────────────────────
+
+ABOUT_LINK = Template(
+    '                <a href="{{href}}" target="_blank" title="{{label}}"'
+    ' style="color: var(--accent-color); font-size: 1.5rem; text-decoration: none;'
+    ' transition: transform 0.2s; display: inline-flex; justify-content: center;'
+    ' align-items: center; width: 40px; height: 40px; border-radius: 50%; background: #f8f9fa;">'
+    '\n                    <i class="{{icon}}"></i>\n                </a>'
+)
+EDU_DETAILS = Template(
+    ' &middot; <span style="font-family: var(--font-mono); color: var(--code-accent); font-size: 0.7rem;">{{details}}</span>'
+)
+EDU_ITEM = Template(
+    '        <div style="margin-bottom: 0.875rem; border-left: 1px solid var(--border-color); padding-left: 0.75rem;">'
+    '\n            <div style="font-size: 0.875rem; font-weight: 500; color: var(--text-color); line-height: 1.35;">{{degree}}</div>'
+    '\n            <div style="font-size: 0.8rem; color: var(--text-muted);">{{school}}{{details_html}}</div>'
+    '\n            <div style="font-family: var(--font-mono); font-size: 0.7rem; color: var(--text-muted); margin-top: 0.1rem;">{{year}}</div>'
+    '\n        </div>'
+)
+INTERESTS_ITEM = Template(
+    '        <div style="margin-bottom: 0.875rem;">'
+    '\n            <div class="interests-container">{{badges}}</div>'
+    '\n        </div>'
+)
+BADGE = Template('<span class="badge">{{text}}</span>')
+RESUME_LINKS = (
+    '<div><a href="assets/pdf/dreyceyalbin_resume.pdf" target="_blank" class="resume-link">'
+    '<i class="bi bi-file-earmark-text"></i> resume.pdf</a>'
+    '<span style="color: var(--border-color); margin: 0 0.35rem;">/</span>'
+    '<a href="assets/pdf/dreyceyalbin_cv.pdf" target="_blank" class="resume-link">cv.pdf</a></div>'
+)
+ABOUT_SECTION = Template('''<section id="about" data-publish-resume="{{publish_resume}}">
         <div class="about-content">
             <div class="about-photo">
-                 <img src="assets/img/me.jpg" alt="{profile['name']}">
-                 <h1 style="font-size: 2rem; margin: 1rem 0 0.5rem;">{profile['name']}</h1>
-                 <p style="font-size: 1.1rem; color: var(--text-muted); margin-bottom: 1rem;">{profile['role']}<br>at {profile['org']}</p>
+                 <img src="{{photo}}" alt="{{name}}"{{photo_attrs}}>
+                 <h1 style="font-size: 2rem; margin: 1rem 0 0.5rem;">{{name}}</h1>
+                 <p style="font-size: 1.1rem; color: var(--text-muted); margin-bottom: 1rem;">{{role}}<br>at {{org}}</p>
                  <div class="about-links">
-{links_html}
+{{links_html}}
                  </div>
-                 {'<div><a href="assets/pdf/dreyceyalbin_resume.pdf" target="_blank" class="resume-link"><i class="bi bi-file-earmark-text"></i> resume.pdf</a><span style="color: var(--border-color); margin: 0 0.35rem;">/</span><a href="assets/pdf/dreyceyalbin_cv.pdf" target="_blank" class="resume-link">cv.pdf</a></div>' if publish_resume else ''}
+                 {{resume_html}}
             </div>
             <div class="about-details">
                 <h2 style="border-bottom: none; margin-bottom: 1rem; margin-top: 0; display: block; line-height: 1;">About Me</h2>
-                <p class="lead">{profile['bio']}</p>
-                <p><i class="bi bi-geo-alt"></i> {profile['location']}</p>
+                <p class="lead">{{bio}}</p>
+                <p><i class="bi bi-geo-alt"></i> {{location}}</p>
                 <div class="info-grid" style="margin-top: 3rem; margin-bottom: 0; padding-top: 0;">
                     <div>
                         <div style="font-family: var(--font-mono); font-size: 0.7rem; color: var(--text-muted); letter-spacing: 0.06em; margin-bottom: 1rem;">education</div>
-{edu_html}
+{{edu_html}}
                     </div>
                     <div>
                         <div style="font-family: var(--font-mono); font-size: 0.7rem; color: var(--text-muted); letter-spacing: 0.06em; margin-bottom: 1rem;">interests</div>
-{interests_html}
+{{interests_html}}
                     </div>
                 </div>
             </div>
         </div>
-    </section>'''
+    </section>''')
 
 
+@fragment
+@timed
+def render_about_section(profile, education, interests, publish_resume=False, photo=None):
+    edu_html = render_each(EDU_ITEM, (
+        {
+            'degree': edu.degree,
+            'school': edu.school,
+            'year': edu.year,
+            'details_html': EDU_DETAILS.render(edu) if edu.details else '',
+        }
+        for edu in education
+    ), '\n')
+    interests_html = render_each(INTERESTS_ITEM, (
+        {'badges': render_each(BADGE, ({'text': item} for item in cat.items))}
+        for cat in interests
+    ), '\n')
+    return ABOUT_SECTION.render({
+        'name': profile.name,
+        'role': profile.role,
+        'org': profile.org,
+        'bio': profile.bio,
+        'location': profile.location,
+        'publish_resume': 'true' if publish_resume else 'false',
+        'photo': PROFILE_IMAGES[0],
+        'photo_attrs': image_attrs(photo, PROFILE_IMAGE_SIZES),
+        'links_html': render_each(ABOUT_LINK, profile.links, '\n'),
+        'resume_html': RESUME_LINKS if publish_resume else '',
+        'edu_html': edu_html,
+        'interests_html': interests_html,
+    })
+
+
+EXPERIENCE_ROLE = Template(
+    '                <div style="margin-bottom: 1.25rem;">\n'
+    '                    <div style="display: flex; justify-content: space-between; flex-wrap: wrap; margin-bottom: 0.25rem;">\n'
+    '                        <span style="font-style: italic; color: var(--text-muted); font-size: 0.9rem;">{{role}}{{level_str}}</span>\n'
+    '                        <span style="font-family: var(--font-mono); font-size: 0.78rem; color: var(--text-muted);">{{period}}</span>\n'
+    '                    </div>\n'
+    '                    <p class="experience-details" style="color: var(--text-muted); font-size: 0.9rem; margin: 0.4rem 0 0; line-height: 1.6;">{{desc}}</p>\n'
+    '                </div>\n'
+)
+EXPERIENCE_ITEM = Template(
+    '        <div class="experience-item{{current_class}}">\n'
+    '            <div class="experience-card">\n'
+    '                <div style="display: flex; justify-content: space-between; flex-wrap: wrap; margin-bottom: 0.75rem;">\n'
+    '                    <h3 style="margin: 0; font-size: 1.1rem;">{{company}}</h3>\n'
+    '                    <span style="color: var(--text-muted); font-size: 0.875rem;">{{location}}</span>\n'
+    '                </div>\n'
+    '{{roles_html}}'
+    '                <button class="experience-toggle" onclick="toggleExperience(this)">Show Details</button>\n'
+    '            </div>\n'
+    '        </div>'
+)
+EXPERIENCE_SECTION = Template(
+    '<section id="experience">\n'
+    '        <h2>Work Experience</h2>\n'
+    '        <div class="experience-list">\n'
+    '{{items}}\n'
+    '        </div>\n'
+    '    </section>'
+)
+
+
+@fragment
+@timed
 def render_experience_section(experience):
     # Group consecutive entries by company
     company_groups = []
     for exp in experience:
-        if company_groups and company_groups[-1][0] == exp['company']:
+        if company_groups and company_groups[-1][0] == exp.company:
             company_groups[-1][1].append(exp)
         else:
-            company_groups.append((exp['company'], [exp]))
+            company_groups.append((exp.company, [exp]))
 
     items = []
     for company, roles in company_groups:
-        location = roles[0].get('location', '')
-        is_current = any('present' in r['period'].lower() for r in roles)
-        current_class = ' current' if is_current else ''
-
-        roles_html = ''
-        for r in roles:
-            level_str = f', {r["level"]}' if r.get('level') else ''
-            desc = r.get('description', '')
-            roles_html += (
-                f'                <div style="margin-bottom: 1.25rem;">\n'
-                f'                    <div style="display: flex; justify-content: space-between; flex-wrap: wrap; margin-bottom: 0.25rem;">\n'
-                f'                        <span style="font-style: italic; color: var(--text-muted); font-size: 0.9rem;">{r["role"]}{level_str}</span>\n'
-                f'                        <span style="font-family: var(--font-mono); font-size: 0.78rem; color: var(--text-muted);">{r["period"]}</span>\n'
-                f'                    </div>\n'
-                f'                    <p class="experience-details" style="color: var(--text-muted); font-size: 0.9rem; margin: 0.4rem 0 0; line-height: 1.6;">{desc}</p>\n'
-                f'                </div>\n'
-            )
-
-        items.append(
-            f'        <div class="experience-item{current_class}">\n'
-            f'            <div class="experience-card">\n'
-            f'                <div style="display: flex; justify-content: space-between; flex-wrap: wrap; margin-bottom: 0.75rem;">\n'
-            f'                    <h3 style="margin: 0; font-size: 1.1rem;">{company}</h3>\n'
-            f'                    <span style="color: var(--text-muted); font-size: 0.875rem;">{location}</span>\n'
-            f'                </div>\n'
-            f'{roles_html}'
-            f'                <button class="experience-toggle" onclick="toggleExperience(this)">Show Details</button>\n'
-            f'            </div>\n'
-            f'        </div>'
-        )
-    return (
-        '<section id="experience">\n'
-        '        <h2>Work Experience</h2>\n'
-        '        <div class="experience-list">\n'
-        + '\n'.join(items) + '\n'
-        '        </div>\n'
-        '    </section>'
-    )
-
-
-def render_featured_pubs_section(pubs):
-    featured = [p for p in pubs if p.get('featured')][:5]
-    items = []
-    for p in featured:
-        links = ''.join(
-            f'<a href="{v}" class="badge">{k}</a>'
-            for k, v in (p.get('links') or {}).items()
-        )
-        items.append(
-            f'        <div class="pub-item">\n'
-            f'            <a href="publications/{p["id"]}/" class="pub-title">{p["title"]}</a>\n'
-            f'            <div class="pub-authors">{", ".join(p["authors"])}</div>\n'
-            f'            <div class="pub-meta">\n'
-            f'                {p["venue"]} {p["year"]}\n'
-            f'                <span class="badge badge-primary">{p["type"]}</span>\n'
-            f'            </div>\n'
-            f'            <div class="pub-links">\n'
-            f'                {links}\n'
-            f'            </div>\n'
-            f'        </div>'
-        )
-    return (
-        '<section id="featured-pubs">\n'
-        '        <div class="section-header">\n'
-        '            <h2>Featured Publications</h2>\n'
-        '            <a href="publications/index.html" class="btn btn-sm btn-outline">View All</a>\n'
-        '        </div>\n'
-        + '\n'.join(items) + '\n'
-        '    </section>'
-    )
-
-
-def render_software_section(projects):
-    items = []
-    for p in projects:
-        img = f'<img src="{p["image"]}" alt="{p["name"]}" loading="lazy">' if p.get('image') else ''
-        items.append(
-            f'            <div class="card">\n'
-            f'                {img}\n'
-            f'                <div style="flex-grow: 1;">\n'
-            f'                    <h3><a href="{p["href"]}" target="_blank">{p["name"]}</a></h3>\n'
-            f'                    <p>{p["desc"]}</p>\n'
-            f'                    <small class="text-muted" style="display: block; margin-top: auto;">{p["stack"]}</small>\n'
-            f'                </div>\n'
-            f'            </div>'
-        )
-    return (
-        '<section id="software">\n'
-        '        <h2>Software / Projects</h2>\n'
-        '        <div class="grid">\n'
-        + '\n'.join(items) + '\n'
-        '        </div>\n'
-        '    </section>'
-    )
-
-
+        roles_html = render_each(EXPERIENCE_ROLE, (
+            {
+                'role': r.role,
+                'level_str': f', {r.level}' if r.level else '',
+                'period': r.period,
+                'desc': r.description,
+            }
+            for r in roles
+        ))
+        items.append(EXPERIENCE_ITEM.render({
+            'current_class': ' current' if any(r.current for r in roles) else '',
+            'company': company,
+            'location': roles[0].location,
+            'roles_html': roles_html,
+        }))
+    return EXPERIENCE_SECTION.render({'items': '\n'.join(items)})
+
+
+BADGE_LINK = Template('<a href="{{href}}" class="badge">{{label}}</a>')
+FEATURED_PUB_ITEM = Template(
+    '        <div class="pub-item">\n'
+    '            <a href="publications/{{id}}/" class="pub-title">{{title}}</a>\n'
+    '            <div class="pub-authors">{{authors}}</div>\n'
+    '            <div class="pub-meta">\n'
+    '                {{venue}} {{year}}\n'
+    '                <span class="badge badge-primary">{{type}}</span>\n'
+    '            </div>\n'
+    '            <div class="pub-links">\n'
+    '                {{links}}\n'
+    '            </div>\n'
+    '        </div>'
+)
+FEATURED_PUBS_SECTION = Template(
+    '<section id="featured-pubs">\n'
+    '        <div class="section-header">\n'
+    '            <h2>Featured Publications</h2>\n'
+    '            <a href="publications/index.html" class="btn btn-sm btn-outline">View All</a>\n'
+    '        </div>\n'
+    '{{items}}\n'
+    '    </section>'
+)
+
+
+def link_rows(links):
+    """(label, href) rows for a record's links mapping."""
+    return [{'label': k, 'href': v} for k, v in links.items()]
+
+
+@fragment
+@timed
+def render_featured_pubs_section(featured_pubs):
+    items = render_each(FEATURED_PUB_ITEM, (
+        {
+            'id': p.id,
+            'title': p.title,
+            'authors': p.authors_text,
+            'venue': p.venue,
+            'year': p.year,
+            'type': p.type,
+            'links': render_each(BADGE_LINK, link_rows(p.links)),
+        }
+        for p in featured_pubs[:5]
+    ), '\n')
+    return FEATURED_PUBS_SECTION.render({'items': items})
+
+
+PROJECT_IMAGE = Template('<img src="{{image}}" alt="{{name}}"{{size_attrs}} loading="lazy">')
+PROJECT_CARD = Template(
+    '            <div class="card">\n'
+    '                {{img}}\n'
+    '                <div style="flex-grow: 1;">\n'
+    '                    <h3><a href="{{href}}" target="_blank">{{name}}</a></h3>\n'
+    '                    <p>{{desc}}</p>\n'
+    '                    <small class="text-muted" style="display: block; margin-top: auto;">{{stack}}</small>\n'
+    '                </div>\n'
+    '            </div>'
+)
+SOFTWARE_SECTION = Template(
+    '<section id="software">\n'
+    '        <h2>Software / Projects</h2>\n'
+    '        <div class="grid">\n'
+    '{{items}}\n'
+    '        </div>\n'
+    '    </section>'
+)
+
+
+@fragment
+@timed
+def render_software_section(projects, images=()):
+    items = render_each(PROJECT_CARD, (
+        {
+            'name': p.name,
+            'desc': p.desc,
+            'href': p.href,
+            'stack': p.stack,
+            'img': PROJECT_IMAGE.render({
+                'image': p.image,
+                'name': p.name,
+                'size_attrs': image_attrs(info, PROJECT_IMAGE_SIZES),
+            }) if p.image else '',
+        }
+        # images has an ImageInfo (or None) per project
+        for p, info in zip(projects, images or itertools.repeat(None))
+    ), '\n')
+    return SOFTWARE_SECTION.render({'items': items})
+
+
+CONTACT_LINK = Template(
+    '<a href="{{href}}" class="btn btn-outline" target="_blank">\n'
+    '                {{icon_html}} {{label}}\n'
+    '            </a>'
+)
+ICON = Template('<i class="{{icon}}"></i>')
+CONTACT_SECTION = Template(
+    '<section id="contact">\n'
+    '        <div style="text-align: center; max-width: 800px; margin: 0 auto;">\n'
+    '            <h2>Contact</h2>\n'
+    '            <p style="margin-bottom: 2rem;">Feel free to reach out for collaborations or questions.</p>\n'
+    '            <div class="filters" style="justify-content: center; gap: 0.75rem;">\n'
+    '                {{links_html}}\n'
+    '            </div>\n'
+    '        </div>\n'
+    '    </section>'
+)
+
+
+@fragment
+@timed
 def render_contact_section(profile):
-    link_items = []
-    for l in profile['links']:
-        icon_html = f'<i class="{l["icon"]}"></i>' if l.get('icon') else ''
-        link_items.append(
-            f'<a href="{l["href"]}" class="btn btn-outline" target="_blank">\n'
-            f'                {icon_html} {l["label"]}\n'
-            f'            </a>'
-        )
-    links_html = ' '.join(link_items)
-    return (
-        '<section id="contact">\n'
-        '        <div style="text-align: center; max-width: 800px; margin: 0 auto;">\n'
-        '            <h2>Contact</h2>\n'
-        '            <p style="margin-bottom: 2rem;">Feel free to reach out for collaborations or questions.</p>\n'
-        '            <div class="filters" style="justify-content: center; gap: 0.75rem;">\n'
-        f'                {links_html}\n'
-        '            </div>\n'
-        '        </div>\n'
-        '    </section>'
-    )
-
-
-# ── Blog section renderer ─────────────────────────────────────────────────────
-
-def render_blog_section(posts):
-    items = []
-    for post in posts:
-        tags_html = ''.join(f'<span class="badge">{t}</span>' for t in post.get('tags', []))
-        items.append(
-            f'        <div class="pub-item">\n'
-            f'            <a href="blog/{post["id"]}/" class="pub-title">{post["title"]}</a>\n'
-            f'            <div class="pub-meta">{post["date"]}</div>\n'
-            f'            <p style="color: var(--text-muted); font-size: 0.95rem; margin: 0.5rem 0;">{post["summary"]}</p>\n'
-            f'            <div style="margin-top: 0.5rem;">{tags_html}</div>\n'
-            f'        </div>'
-        )
-    return (
-        '<section id="blog">\n'
-        '        <div class="section-header">\n'
-        '            <h2>Blog</h2>\n'
-        '        </div>\n'
-        + '\n'.join(items) + '\n'
-        '    </section>'
-    )
+    links_html = render_each(CONTACT_LINK, (
+        {'href': l.href, 'label': l.label, 'icon_html': ICON.render(l) if l.icon else ''}
+        for l in profile.links
+    ), ' ')
+    return CONTACT_SECTION.render({'links_html': links_html})
+
+
+# ── Home page data bundle ─────────────────────────────────────────────────────
+
+# Fields main.js reads from each collection; everything else stays out of the bundle
+SITE_DATA_FIELDS = {
+    "profile": ("name", "role", "org", "bio", "location", "links"),
+    "pubs": ("id", "title", "authors", "venue", "year", "type", "links", "featured"),
+    "projects": ("name", "desc", "href", "stack", "image"),
+    "experience": ("company", "role", "level", "location", "period", "description", "details"),
+    "education": ("degree", "school", "details", "year"),
+    "interests": ("category", "items"),
+}
+SITE_DATA_PRELOAD = Template(
+    '    <link rel="preload" id="site-data" href="{{href}}" as="fetch" crossorigin="anonymous">'
+)
+
+
+def pick(record, fields):
+    data = record.to_json()
+    return {k: data[k] for k in fields if k in data}
+
+
+@timed
+def site_data_json(profile, featured_pubs, projects, experience, education, interests, images):
+    """One compact bundle with everything the home page renders client-side.
+
+    Publications are the featured ones only, without abstracts. images maps
+    each local image to its size and srcset.
+    """
+    f = SITE_DATA_FIELDS
+    return compact_json({
+        "profile": pick(profile, f["profile"]),
+        "pubs": [pick(p, f["pubs"]) for p in featured_pubs],
+        "projects": [pick(p, f["projects"]) for p in projects],
+        "experience": [pick(e, f["experience"]) for e in experience],
+        "education": [pick(e, f["education"]) for e in education],
+        "interests": [pick(i, f["interests"]) for i in interests],
+        "images": {path: info._asdict() for path, info in images.items()},
+    })
+
+
+def write_site_data(*data):
+    """Write data/site.<hash>.json; returns (path, written)."""
+    content = site_data_json(*data)
+    name = hashed_name("site", "json", content)
+    written = write_file(f"data/{name}", content)
+    remove_stale_hashed("data", "site", "json", name)
+    return f"data/{name}", written
 
 
 # ── Schema.org JSON-LD ────────────────────────────────────────────────────────
 
+@fragment
+@timed
 def person_jsonld(profile, education):
     edu_items = [
         {
             "@type": "EducationalOccupationalCredential",
-            "credentialCategory": edu["degree"],
-            "recognizedBy": {"@type": "EducationalOrganization", "name": edu["school"]},
+            "credentialCategory": edu.degree,
+            "recognizedBy": {"@type": "EducationalOrganization", "name": edu.school},
         }
         for edu in education
     ]
     schema = {
         "@context": "https://schema.org",
         "@type": "Person",
-        "name": profile["name"],
-        "jobTitle": profile["role"],
-        "worksFor": {"@type": "Organization", "name": profile["org"]},
+        "name": profile.name,
+        "jobTitle": profile.role,
+        "worksFor": {"@type": "Organization", "name": profile.org},
         "url": BASE_URL + "/",
-        "sameAs": [l["href"] for l in profile["links"] if l["href"].startswith("http")],
+        "sameAs": [l.href for l in profile.links if l.href.startswith("http")],
         "alumniOf": edu_items,
     }
     return f'<script type="application/ld+json">\n{json.dumps(schema, indent=2)}\n</script>'
 
 
+@timed
 def scholarly_article_jsonld(pub):
     schema = {
         "@context": "https://schema.org",
         "@type": "ScholarlyArticle",
-        "name": pub["title"],
-        "headline": pub["title"],
-        "author": [{"@type": "Person", "name": a} for a in pub["authors"]],
-        "datePublished": str(pub["year"]),
-        "isPartOf": {"@type": "Periodical", "name": pub["venue"]},
-        "description": pub.get("abstract", ""),
-        "url": f'{BASE_URL}/publications/{pub["id"]}/',
+        "name": pub.title,
+        "headline": pub.title,
+        "author": [{"@type": "Person", "name": a} for a in pub.authors],
+        "datePublished": str(pub.year),
+        "isPartOf": {"@type": "Periodical", "name": pub.venue},
+        "description": pub.abstract,
+        "url": f"{BASE_URL}/publications/{pub.id}/",
     }
-    if pub.get("links", {}).get("paper"):
-        schema["sameAs"] = pub["links"]["paper"]
+    if pub.links.get("paper"):
+        schema["sameAs"] = pub.links["paper"]
     return f'<script type="application/ld+json">\n{json.dumps(schema, indent=2)}\n</script>'
 
 
 # ── Publication page generator ────────────────────────────────────────────────
 
-def generate_pub_page(pub):
-    authors_html = ', '.join(
-        f'<a href="/publications/?q={quote(a)}">{a}</a>'
-        for a in pub['authors']
-    )
-    links_html = ''.join(
-        f'<a href="{v}" class="btn btn-sm btn-outline" style="margin-right:0.5rem">{k}</a>'
-        for k, v in (pub.get('links') or {}).items()
-    )
-    tags_html = ''
-    if pub.get('tags'):
-        tag_badges = ' '.join(
-            f'<a href="/publications/?q={quote(t)}" class="badge">{t}</a>'
-            for t in pub['tags']
-        )
-        tags_html = (
-            '\n        <div class="pub-tags">\n'
-            f'            <strong>Tags:</strong> {tag_badges}\n'
-            '        </div>'
-        )
-
-    jsonld = scholarly_article_jsonld(pub)
-    abstract = pub.get('abstract') or 'No abstract available.'
-
-    return f'''<!DOCTYPE html>
+AUTHOR_LINK = Template('<a href="/publications/author/{{slug}}/">{{text}}</a>')
+TAG_BADGE = Template('<a href="/publications/tag/{{slug}}/" class="badge">{{text}}</a>')
+BUTTON_LINK = Template('<a href="{{href}}" class="btn btn-sm btn-outline" style="margin-right:0.5rem">{{label}}</a>')
+PUB_TAGS = Template(
+    '\n        <div class="pub-tags">\n'
+    '            <strong>Tags:</strong> {{badges}}\n'
+    '        </div>'
+)
+PUB_PAGE = Template('''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{pub['title']} - Publications</title>
-    <meta name="description" content="{pub.get('abstract', '')}">
+    <title>{{title}} - Publications</title>
+    <meta name="description" content="{{description}}">
     <meta property="og:type" content="article">
-    <meta property="og:url" content="{BASE_URL}/publications/{pub['id']}/">
-    <meta property="og:title" content="{pub['title']} - Dreycey Albin">
-    <meta property="og:description" content="{pub.get('abstract', '')}">
-    <script>try{{var t=localStorage.getItem('theme');if(t)document.documentElement.setAttribute('data-theme',t);}}catch(e){{}}</script>
+    <meta property="og:url" content="{{base_url}}/publications/{{id}}/">
+    <meta property="og:title" content="{{title}} - Dreycey Albin">
+    <meta property="og:description" content="{{description}}">
+    <script>try{var t=localStorage.getItem('theme');if(t)document.documentElement.setAttribute('data-theme',t);}catch(e){}</script>
     <link rel="stylesheet" href="../../assets/css/base.css">
     <link rel="stylesheet" href="../../assets/css/components.css">
     <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap-icons@1.8.0/font/bootstrap-icons.css">
-    {jsonld}
+    {{jsonld}}
 </head>
 <body>
     <div id="site-header"></div>
 
     <main class="container">
-        <div id="pub-detail" data-pub-id="{pub['id']}" style="padding-top: 2rem;">
-            <h1>{pub['title']}</h1>
+        <div id="pub-detail" data-pub-id="{{id}}" data-pub-src="{{data_src}}" style="padding-top: 2rem;">
+            <h1>{{title}}</h1>
             <div class="pub-meta" style="font-size: 1.1rem; margin-bottom: 1rem;">
-                {pub['venue']} {pub['year']} <span class="badge badge-primary">{pub['type']}</span>
+                {{venue}} {{year}} <span class="badge badge-primary">{{type}}</span>
             </div>
 
             <div class="pub-authors" style="font-size: 1.1rem; margin-bottom: 1rem;">
-                <strong>Authors:</strong> {authors_html}
+                <strong>Authors:</strong> {{authors_html}}
             </div>
 
             <div class="pub-links" style="margin-bottom: 2rem;">
-                {links_html}
+                {{links_html}}
             </div>
 
             <div class="pub-abstract card" style="margin-bottom: 2rem;">
                 <h3>Abstract</h3>
-                <p>{abstract}</p>
+                <p>{{abstract}}</p>
             </div>
-{tags_html}
+{{tags_html}}
             <div style="margin-top: 3rem;">
                 <a href="/publications/">&larr; Back to Publications</a>
             </div>
@@ -386,106 +1730,475 @@ def generate_pub_page(pub):
     <script src="../../assets/js/render.js"></script>
     <script src="../../assets/js/publication.js"></script>
 </body>
-</html>'''
+</html>''')
+
+
+def name_rows(names, slugs):
+    return [{'slug': slug, 'text': name} for name, slug in zip(names, slugs)]
+
+
+@timed
+def generate_pub_page(pub):
+    tags_html = ''
+    if pub.tags:
+        tags_html = PUB_TAGS.render({'badges': render_each(TAG_BADGE, name_rows(pub.tags, pub.tag_slugs), ' ')})
+
+    return PUB_PAGE.render({
+        'id': pub.id,
+        'title': pub.title,
+        'venue': pub.venue,
+        'year': pub.year,
+        'type': pub.type,
+        'base_url': BASE_URL,
+        'data_src': pub_shard_name(pub),
+        'description': pub.abstract,
+        'abstract': pub.abstract or 'No abstract available.',
+        'jsonld': scholarly_article_jsonld(pub),
+        'authors_html': render_each(AUTHOR_LINK, name_rows(pub.authors, pub.author_slugs), ', '),
+        'links_html': render_each(BUTTON_LINK, link_rows(pub.links)),
+        'tags_html': tags_html,
+    })
+
+
+def pub_page_path(pub):
+    return f"publications/{pub.id}/index.html"
+
+
+def pub_shard_name(pub):
+    """Content-hashed name of the JSON record written next to the pub page."""
+    return hashed_name("data", "json", compact_json(pub.to_json()))
+
+
+def build_pub_page(pub, opts=None):
+    """Write one publication page and its JSON shard (pool worker).
+
+    Returns (path, written, size_before, size_after): written is True if
+    either file changed, and the sizes are the page's bytes before and after
+    finish_page() (see finished_size()).
+    """
+    path = pub_page_path(pub)
+    dirname = os.path.dirname(path)
+    shard = pub_shard_name(pub)
+    shard_written = write_file(os.path.join(dirname, shard), compact_json(pub.to_json()))
+    remove_stale_hashed(dirname, "data", "json", shard)
+    html = generate_pub_page(pub)
+    before = len(html.encode("utf-8"))
+    if opts:
+        html = finish_page(html, path, opts)
+    return path, write_file(path, html) or shard_written, before, finished_size(html, opts)
 
 
 # ── Publications list pre-render ──────────────────────────────────────────────
 
-def render_pub_list(pubs):
-    """Pre-render all publications sorted by year desc for static crawlers."""
-    sorted_pubs = sorted(pubs, key=lambda p: p['year'], reverse=True)
-    items = []
+PAPER_BUTTON = Template(
+    '<a href="{{paper}}" class="btn btn-sm btn-outline"'
+    ' target="_blank" style="margin-right: 0.5rem;">Paper</a>'
+)
+CODE_BUTTON = Template('<a href="{{code}}" class="btn btn-sm btn-outline" target="_blank">Code</a>')
+PUB_LIST_ITEM = Template(
+    '        <div class="pub-item" data-id="{{id}}" data-year="{{year}}">\n'
+    '            <a href="{{pub_base}}{{id}}/" class="pub-title">{{title}}</a>\n'
+    '            <div class="pub-authors">{{authors}}</div>\n'
+    '            <div class="pub-meta">\n'
+    '                {{venue}} {{year}}\n'
+    '            </div>\n'
+    '            <details class="pub-abstract">\n'
+    '                <summary class="pub-abstract-toggle"><span class="pub-abstract-label-more">Expand abstract</span><span class="pub-abstract-label-less">Hide abstract</span></summary>\n'
+    '                <div class="pub-abstract-body">{{abstract}}</div>\n'
+    '            </details>\n'
+    '            <div class="pub-links" style="margin-top:0.5rem">\n'
+    '                {{paper_btn}}{{code_btn}}\n'
+    '            </div>\n'
+    '        </div>'
+)
+PUB_LIST_OPEN = Template('<div id="pub-list"{{data_attr}}>\n')
+PUB_LIST_CLOSE = '\n        </div>'
+
+
+def sort_pubs(pubs):
+    """Year desc, the list order; computed once as SiteData.sorted_pubs."""
+    return sorted(pubs, key=attrgetter('year'), reverse=True)
+
+
+def iter_pub_list(pubs, data_src=None, total=None, pub_base=''):
+    """Pre-render publications, already in list order, for static crawlers.
+
+    Yields the list one item at a time. data_src, if given, is exposed to
+    the client as data-pubs-src, and total as data-total (the size of the
+    whole catalogue, when pubs is one page of it). Item links are
+    pub_base + id + "/".
+    """
+    attrs = f' data-pubs-src="{data_src}"' if data_src else ''
+    if total is not None:
+        attrs += f' data-total="{total}"'
+    yield PUB_LIST_OPEN.render({'data_attr': attrs})
+    for i, p in enumerate(pubs):
+        if i:
+            yield '\n'
+        yield render_pub_list_item(p, pub_base)
+    yield PUB_LIST_CLOSE
+
+
+@fragment
+def render_pub_list_item(p, pub_base):
+    """One list entry; the same pub appears on the shell and on several listing pages."""
+    links = p.links
+    return PUB_LIST_ITEM.render({
+        'id': p.id,
+        'year': p.year,
+        'title': p.title,
+        'venue': p.venue,
+        'pub_base': pub_base,
+        'authors': p.authors_text,
+        'abstract': p.abstract,
+        'paper_btn': PAPER_BUTTON.render(links) if links.get('paper') else '',
+        'code_btn': CODE_BUTTON.render(links) if links.get('code') else '',
+    })
+
+
+@timed
+def render_pub_list(pubs, data_src=None, total=None, pub_base=''):
+    """iter_pub_list() as one string."""
+    return ''.join(iter_pub_list(pubs, data_src, total, pub_base))
+
+
+PUBS_MIN_DIR = "data"
+
+
+@timed
+def pubs_min_json(sorted_pubs):
+    """Slim catalogue for list views: every field except the abstract."""
+    slim = []
     for p in sorted_pubs:
-        paper_btn = (
-            f'<a href="{p["links"]["paper"]}" class="btn btn-sm btn-outline"'
-            f' target="_blank" style="margin-right: 0.5rem;">Paper</a>'
-            if p.get('links', {}).get('paper') else ''
-        )
-        code_btn = (
-            f'<a href="{p["links"]["code"]}" class="btn btn-sm btn-outline" target="_blank">Code</a>'
-            if p.get('links', {}).get('code') else ''
-        )
-        items.append(
-            f'        <div class="pub-item">\n'
-            f'            <a href="{p["id"]}/" class="pub-title">{p["title"]}</a>\n'
-            f'            <div class="pub-authors">{", ".join(p["authors"])}</div>\n'
-            f'            <div class="pub-meta">\n'
-            f'                {p["venue"]} {p["year"]}\n'
-            f'            </div>\n'
-            f'            <details class="pub-abstract">\n'
-            f'                <summary class="pub-abstract-toggle"><span class="pub-abstract-label-more">Expand abstract</span><span class="pub-abstract-label-less">Hide abstract</span></summary>\n'
-            f'                <div class="pub-abstract-body">{p.get("abstract", "")}</div>\n'
-            f'            </details>\n'
-            f'            <div class="pub-links" style="margin-top:0.5rem">\n'
-            f'                {paper_btn}{code_btn}\n'
-            f'            </div>\n'
-            f'        </div>'
-        )
-    return (
-        '<div id="pub-list">\n'
-        + '\n'.join(items) + '\n'
-        '        </div>'
-    )
+        record = p.to_json()
+        record.pop('abstract', None)
+        slim.append(record)
+    return compact_json(slim)
 
 
-# ── Blog page generators ──────────────────────────────────────────────────────
+def write_pubs_min(sorted_pubs):
+    """Write data/publications.min.<hash>.json; returns (path, written)."""
+    content = pubs_min_json(sorted_pubs)
+    name = hashed_name("publications.min", "json", content)
+    written = write_file(f"{PUBS_MIN_DIR}/{name}", content)
+    remove_stale_hashed(PUBS_MIN_DIR, "publications.min", "json", name)
+    return f"{PUBS_MIN_DIR}/{name}", written
 
-def generate_blog_index_page(blog):
-    name = blog.get('name', 'Blog')
-    tagline = blog.get('tagline', '')
-    platforms = blog.get('platforms', [])
-    posts = sorted(blog.get('posts', []), key=lambda p: p['date'], reverse=True)
 
-    # Compact platform links
-    platform_links = ''
-    featured_embed = ''
-    for p in platforms:
-        platform_links += (
-            f'<a href="{p["url"]}" target="_blank" style="display: inline-flex; align-items: center; gap: 0.4rem;'
-            f' color: var(--text-muted); font-size: 0.875rem; font-family: var(--font-mono);">'
-            f'<i class="{p["icon"]}"></i> {p["name"]} &nearr;</a>\n            '
-        )
-        if p.get('featured_video_id'):
-            featured_embed = (
-                f'        <div style="margin-top: 2.5rem;">\n'
-                f'            <div style="font-family: var(--font-mono); font-size: 0.7rem; color: var(--text-muted); letter-spacing: 0.06em; margin-bottom: 0.75rem;">featured</div>\n'
-                f'            <div style="position: relative; padding-bottom: 56.25%; height: 0; overflow: hidden; border-radius: var(--border-radius); border: 1px solid var(--border-color);">\n'
-                f'                <iframe src="https://www.youtube.com/embed/{p["featured_video_id"]}" title="Featured video" frameborder="0" allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture" allowfullscreen style="position: absolute; top: 0; left: 0; width: 100%; height: 100%;"></iframe>\n'
-                f'            </div>\n'
-                f'        </div>\n'
-            )
+# ── Publication listing pages ─────────────────────────────────────────────────
 
-    # Chronological post list
-    post_rows = ''
-    for post in posts:
-        post_rows += (
-            f'        <div style="display: flex; align-items: baseline; gap: 1.5rem; padding: 0.6rem 0; border-bottom: 1px solid var(--border-color);">\n'
-            f'            <span style="font-family: var(--font-mono); font-size: 0.75rem; color: var(--text-muted); white-space: nowrap;">{post["date"]}</span>\n'
-            f'            <a href="{post["url"]}" target="_blank" style="color: var(--text-color); font-size: 0.95rem;">{post["title"]} &nearr;</a>\n'
-            f'        </div>\n'
-        )
+PUBS_PER_PAGE = 25
+LISTINGS_DIR = "publications"
+# Listing directories under publications/, so no publication id may use these
+LISTING_KINDS = ("page", "year", "type", "author", "tag")
 
-    posts_section = ''
-    if post_rows:
-        posts_section = (
-            f'        <div style="margin-top: 2.5rem;">\n'
-            f'            <div style="font-family: var(--font-mono); font-size: 0.7rem; color: var(--text-muted); letter-spacing: 0.06em; margin-bottom: 0.75rem;">posts</div>\n'
-            f'{post_rows}'
-            f'        </div>\n'
+LISTING_PAGE = Template('''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{{title}} - Dreycey Albin</title>
+    <meta name="description" content="{{title}} by Dreycey Albin, page {{page}} of {{pages}}.">
+    <link rel="canonical" href="{{base_url}}/{{url}}">
+{{rel_links}}    <script>try{var t=localStorage.getItem('theme');if(t)document.documentElement.setAttribute('data-theme',t);}catch(e){}</script>
+    <link rel="stylesheet" href="{{root}}assets/css/base.css">
+    <link rel="stylesheet" href="{{root}}assets/css/components.css">
+    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap-icons@1.8.0/font/bootstrap-icons.css">
+</head>
+<body>
+    <div id="site-header"></div>
+
+    <main class="container">
+        <h1>{{title}}</h1>
+        <p><a href="/publications/">&larr; Search all publications</a></p>
+{{facets}}
+{{publist}}
+{{pager}}
+    </main>
+
+    <div id="site-footer"></div>
+
+    <script src="{{root}}assets/js/render.js"></script>
+</body>
+</html>''')
+REL_LINK = Template('    <link rel="{{rel}}" href="{{href}}">\n')
+FACET_LINK = Template('<a href="{{href}}" data-{{kind}}="{{value}}">{{label}}</a>&nbsp;<span class="facet-count">{{count}}</span>')
+FACET_NAV = Template(
+    '        <nav class="pub-facets" id="pub-facets" aria-label="Browse publications">\n'
+    '            <div><strong>Year:</strong> {{years}}</div>\n'
+    '            <div><strong>Type:</strong> {{types}}</div>\n'
+    '        </nav>'
+)
+PAGER = Template(
+    '        <nav class="pub-pager" id="pub-pager" aria-label="Pages">\n'
+    '            {{prev}}<span>Page {{page}} of {{pages}}</span>{{next}}\n'
+    '        </nav>'
+)
+PREV_LINK = Template('<a href="{{href}}" rel="prev">&larr; Newer</a>')
+NEXT_LINK = Template('<a href="{{href}}" rel="next">Older &rarr;</a>')
+
+
+def slugify(text):
+    """Accent-folded, lowercase, hyphenated. Mirrored by slugify() in publication.js."""
+    folded = unicodedata.normalize('NFKD', str(text)).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '-', folded.lower()).strip('-')
+
+
+@cache
+def name_slug(name):
+    """URL slug for an author or tag page; hashed if nothing survives slugify().
+
+    Mirrored by nameSlug() in publication.js.
+    """
+    return slugify(name) or hashlib.sha256(name.encode("utf-8")).hexdigest()[:10]
+
+
+Facets = namedtuple("Facets", "years types authors tags")
+
+
+def _group_names(groups, pub, names, slugs):
+    for name, slug in zip(names, slugs):
+        _, group = groups.setdefault(slug, (name, []))
+        if not group or group[-1] is not pub:
+            group.append(pub)
+
+
+def pub_facets(sorted_pubs):
+    """Group an already sorted catalogue by year, type, author and tag in one pass.
+
+    years and types map each value to its pubs; authors and tags map each
+    slug to (name, pubs), name being the first spelling seen. Every group
+    keeps the list order.
+    """
+    years, types, authors, tags = defaultdict(list), defaultdict(list), {}, {}
+    for pub in sorted_pubs:
+        years[pub.year].append(pub)
+        types[pub.type].append(pub)
+        _group_names(authors, pub, pub.authors, pub.author_slugs)
+        _group_names(tags, pub, pub.tags, pub.tag_slugs)
+    return Facets(years, types, authors, tags)
+
+
+def listing_url(base, page):
+    """Site path of page (1-based) of the listing rooted at base."""
+    return base if page == 1 else f"{base}page/{page}/"
+
+
+def listings(sorted_pubs, facets):
+    """(base, title, pubs) for the full catalogue and every facet."""
+    return [
+        (f"{LISTINGS_DIR}/", "Publications", sorted_pubs),
+        *((f"{LISTINGS_DIR}/year/{year}/", f"Publications from {year}", group)
+          for year, group in sorted(facets.years.items(), reverse=True)),
+        *((f"{LISTINGS_DIR}/type/{slugify(kind)}/", f"{kind.capitalize()} publications", group)
+          for kind, group in sorted(facets.types.items())),
+        *((f"{LISTINGS_DIR}/author/{slug}/", f"Publications by {name}", group)
+          for slug, (name, group) in sorted(facets.authors.items())),
+        *((f"{LISTINGS_DIR}/tag/{slug}/", f"Publications tagged {name}", group)
+          for slug, (name, group) in sorted(facets.tags.items())),
+    ]
+
+
+def render_facet_nav(facets):
+    """Year and type links with precomputed counts."""
+    years, types = facets.years, facets.types
+    return FACET_NAV.render({
+        'years': ' '.join(FACET_LINK.render({
+            'href': f"/{LISTINGS_DIR}/year/{year}/", 'kind': 'year', 'value': year,
+            'label': year, 'count': len(group),
+        }) for year, group in sorted(years.items(), reverse=True)),
+        'types': ' '.join(FACET_LINK.render({
+            'href': f"/{LISTINGS_DIR}/type/{slugify(kind)}/", 'kind': 'type', 'value': slugify(kind),
+            'label': kind.capitalize(), 'count': len(group),
+        }) for kind, group in sorted(types.items())),
+    })
+
+
+def pager_parts(base, page, pages):
+    """(rel links for <head>, pager nav) for page of pages; both empty for one page."""
+    if pages == 1:
+        return '', ''
+    prev_url = listing_url(base, page - 1) if page > 1 else None
+    next_url = listing_url(base, page + 1) if page < pages else None
+    rel_links = ''.join(REL_LINK.render({'rel': rel, 'href': f"{BASE_URL}/{url}"})
+                        for rel, url in (("prev", prev_url), ("next", next_url)) if url)
+    return rel_links, PAGER.render({
+        'prev': PREV_LINK.render({'href': f"/{prev_url}"}) if prev_url else '',
+        'next': NEXT_LINK.render({'href': f"/{next_url}"}) if next_url else '',
+        'page': page,
+        'pages': pages,
+    })
+
+
+def listing_pages(sorted_pubs, facets, per_page=PUBS_PER_PAGE):
+    """Every generated listing page as (path, context) for render_listing_page().
+
+    Page 1 of the full catalogue is the publications/index.html shell and
+    is not included.
+    """
+    facet_nav = render_facet_nav(facets)
+    pages = []
+    for base, title, group in listings(sorted_pubs, facets):
+        count = max(1, -(-len(group) // per_page))
+        for page in range(1, count + 1):
+            url = listing_url(base, page)
+            if url == f"{LISTINGS_DIR}/":
+                continue
+            rel_links, pager = pager_parts(base, page, count)
+            pages.append((url + "index.html", {
+                'url': url, 'title': title, 'page': page, 'pages': count,
+                'pubs': group[(page - 1) * per_page:page * per_page],
+                'rel_links': rel_links, 'pager': pager, 'facets': facet_nav,
+            }))
+    return pages
+
+
+@timed
+def render_listing_page(path, ctx):
+    root = '../' * path.count('/')
+    return LISTING_PAGE.render({
+        **ctx,
+        'base_url': BASE_URL,
+        'root': root,
+        'publist': render_pub_list(ctx['pubs'], pub_base=f"/{LISTINGS_DIR}/"),
+    })
+
+
+def remove_stale_listings(keep):
+    """Delete generated listing pages (and their sidecars) not in keep."""
+    for kind in LISTING_KINDS:
+        top = os.path.join(LISTINGS_DIR, kind)
+        for dirpath, _, filenames in os.walk(top):
+            for name in filenames:
+                path = os.path.join(dirpath, name).replace(os.sep, "/")
+                if sidecar_source(path) not in keep:
+                    WRITER.remove(path)
+
+
+# ── Publication search index ──────────────────────────────────────────────────
+
+SEARCH_FIELDS = ("title", "author", "tag", "abstract")
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def search_tokens(text):
+    """Lowercase ASCII word tokens with accents folded (mirrored in publications.js)."""
+    folded = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return _TOKEN_RE.findall(folded.lower())
+
+
+def shard_key(term):
+    return term[:2]
+
+
+@timed
+def build_search_index(sorted_pubs, shard_terms=SEARCH_SHARD_TERMS):
+    """Build the inverted index for the publications page.
+
+    Returns {path: payload}. Every term maps to a list of postings, one per
+    field it occurs in: [field, doc, doc, ...], where field indexes
+    SEARCH_FIELDS and each doc indexes "docs" (publication ids, in list
+    order). The client resolves a query word by prefix-scanning the terms,
+    so when the index has more than shard_terms terms (or shard_terms is 0)
+    the terms move into data/search/<first two chars>.json shards and the
+    main file lists the shard keys instead.
+    """
+    terms = {}
+    for doc, p in enumerate(sorted_pubs):
+        fields = (
+            [p.title],
+            p.authors,
+            p.tags,
+            [p.abstract],
         )
+        for field, values in enumerate(fields):
+            for value in values:
+                for term in search_tokens(value):
+                    postings = terms.setdefault(term, ([], [], [], []))[field]
+                    if not postings or postings[-1] != doc:
+                        postings.append(doc)
+
+    terms = {
+        term: [[field] + docs for field, docs in enumerate(postings) if docs]
+        for term, postings in terms.items()
+    }
+    index = {
+        "version": 1,
+        "fields": list(SEARCH_FIELDS),
+        "docs": [p.id for p in sorted_pubs],
+    }
+    if len(terms) <= shard_terms:
+        index["terms"] = dict(sorted(terms.items()))
+        return {SEARCH_INDEX_PATH: index}
+
+    shards = {}
+    for term in sorted(terms):
+        shards.setdefault(shard_key(term), {})[term] = terms[term]
+    index["shards"] = sorted(shards)
+    outputs = {SEARCH_INDEX_PATH: index}
+    for key, shard in shards.items():
+        outputs[f"{SEARCH_SHARD_DIR}/{key}.json"] = {"terms": shard}
+    return outputs
+
+
+def write_search_index(sorted_pubs, shard_terms):
+    """Write the search index, dropping shards that no longer exist."""
+    outputs = build_search_index(sorted_pubs, shard_terms)
+    written = sum(write_file(path, compact_json(data)) for path, data in outputs.items())
+    for name in WRITER.listdir(SEARCH_SHARD_DIR):
+        path = f"{SEARCH_SHARD_DIR}/{name}"
+        if sidecar_source(path) not in outputs:
+            WRITER.remove(path)
+    return written
+
+
+def search_index_paths():
+    """The search index and whichever shards are currently on disk."""
+    return [SEARCH_INDEX_PATH] + [
+        f"{SEARCH_SHARD_DIR}/{name}" for name in WRITER.listdir(SEARCH_SHARD_DIR)
+        if sidecar_source(name) == name
+    ]
+
 
-    return f'''<!DOCTYPE html>
+# ── Blog page generators ──────────────────────────────────────────────────────
+
+PLATFORM_LINK = Template(
+    '<a href="{{url}}" target="_blank" style="display: inline-flex; align-items: center; gap: 0.4rem;'
+    ' color: var(--text-muted); font-size: 0.875rem; font-family: var(--font-mono);">'
+    '<i class="{{icon}}"></i> {{name}} &nearr;</a>\n            '
+)
+FEATURED_VIDEO = Template(
+    '        <div style="margin-top: 2.5rem;">\n'
+    '            <div style="font-family: var(--font-mono); font-size: 0.7rem; color: var(--text-muted); letter-spacing: 0.06em; margin-bottom: 0.75rem;">featured</div>\n'
+    '            <div style="position: relative; padding-bottom: 56.25%; height: 0; overflow: hidden; border-radius: var(--border-radius); border: 1px solid var(--border-color);">\n'
+    '                <iframe src="https://www.youtube.com/embed/{{featured_video_id}}" title="Featured video" frameborder="0" allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture" allowfullscreen style="position: absolute; top: 0; left: 0; width: 100%; height: 100%;"></iframe>\n'
+    '            </div>\n'
+    '        </div>\n'
+)
+POST_ROW = Template(
+    '        <div style="display: flex; align-items: baseline; gap: 1.5rem; padding: 0.6rem 0; border-bottom: 1px solid var(--border-color);">\n'
+    '            <span style="font-family: var(--font-mono); font-size: 0.75rem; color: var(--text-muted); white-space: nowrap;">{{date}}</span>\n'
+    '            <a href="{{url}}" target="_blank" style="color: var(--text-color); font-size: 0.95rem;">{{title}} &nearr;</a>\n'
+    '        </div>\n'
+)
+POSTS_SECTION = Template(
+    '        <div style="margin-top: 2.5rem;">\n'
+    '            <div style="font-family: var(--font-mono); font-size: 0.7rem; color: var(--text-muted); letter-spacing: 0.06em; margin-bottom: 0.75rem;">posts</div>\n'
+    '{{post_rows}}'
+    '        </div>\n'
+)
+BLOG_INDEX_PAGE = Template('''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{name} - Dreycey Albin</title>
-    <meta name="description" content="{tagline}">
+    <title>{{name}} - Dreycey Albin</title>
+    <meta name="description" content="{{tagline}}">
     <meta property="og:type" content="website">
-    <meta property="og:url" content="{BASE_URL}/blog/">
-    <meta property="og:title" content="{name} - Dreycey Albin">
-    <meta property="og:description" content="{tagline}">
-    <script>try{{var t=localStorage.getItem('theme');if(t)document.documentElement.setAttribute('data-theme',t);}}catch(e){{}}</script>
+    <meta property="og:url" content="{{base_url}}/blog/">
+    <meta property="og:title" content="{{name}} - Dreycey Albin">
+    <meta property="og:description" content="{{tagline}}">
+    <script>try{var t=localStorage.getItem('theme');if(t)document.documentElement.setAttribute('data-theme',t);}catch(e){}</script>
     <link rel="stylesheet" href="../assets/css/base.css">
     <link rel="stylesheet" href="../assets/css/components.css">
     <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap-icons@1.8.0/font/bootstrap-icons.css">
@@ -495,133 +2208,1659 @@ def generate_blog_index_page(blog):
 
     <main class="container">
         <div style="padding-top: 2rem; max-width: 700px;">
-            <h1>{name}</h1>
-            <p style="color: var(--text-muted); margin-bottom: 1.5rem;">{tagline}</p>
+            <h1>{{name}}</h1>
+            <p style="color: var(--text-muted); margin-bottom: 1.5rem;">{{tagline}}</p>
             <div style="display: flex; gap: 1.5rem; flex-wrap: wrap;">
-            {platform_links}</div>
-{featured_embed}{posts_section}        </div>
+            {{platform_links}}</div>
+{{featured_embed}}{{posts_section}}        </div>
     </main>
 
     <div id="site-footer"></div>
 
     <script src="../assets/js/render.js"></script>
 </body>
-</html>'''
+</html>''')
 
 
-# ── Sitemap ───────────────────────────────────────────────────────────────────
+@timed
+def generate_blog_index_page(blog):
+    # The last platform with a featured video wins the embed slot
+    featured_embed = ''
+    for p in blog.platforms:
+        if p.featured_video_id:
+            featured_embed = FEATURED_VIDEO.render(p)
 
-def generate_sitemap(pubs, blog_posts=None):
-    today = date.today().isoformat()
-    pub_urls = '\n'.join(
-        f'   <url>\n'
-        f'      <loc>{BASE_URL}/publications/{pub["id"]}/</loc>\n'
-        f'      <lastmod>{today}</lastmod>\n'
-        f'      <changefreq>yearly</changefreq>\n'
-        f'      <priority>0.6</priority>\n'
-        f'   </url>'
-        for pub in pubs
-    )
-    blog_urls = ''
-    if blog_posts:
-        blog_urls = (
-            '\n   <url>\n'
-            f'      <loc>{BASE_URL}/blog/</loc>\n'
-            f'      <lastmod>{today}</lastmod>\n'
-            '      <changefreq>monthly</changefreq>\n'
-            '      <priority>0.7</priority>\n'
-            '   </url>'
-        )
-    return (
-        '<?xml version="1.0" encoding="UTF-8"?>\n'
-        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
-        '   <url>\n'
-        f'      <loc>{BASE_URL}/</loc>\n'
-        f'      <lastmod>{today}</lastmod>\n'
-        '      <changefreq>monthly</changefreq>\n'
-        '      <priority>1.0</priority>\n'
-        '   </url>\n'
-        '   <url>\n'
-        f'      <loc>{BASE_URL}/publications/</loc>\n'
-        f'      <lastmod>{today}</lastmod>\n'
-        '      <changefreq>monthly</changefreq>\n'
-        '      <priority>0.8</priority>\n'
-        '   </url>\n'
-        f'{pub_urls}{blog_urls}\n'
-        '</urlset>\n'
-    )
+    # Chronological post list
+    post_rows = render_each(POST_ROW, blog.recent_posts)
+
+    return BLOG_INDEX_PAGE.render({
+        'name': blog.name,
+        'tagline': blog.tagline,
+        'base_url': BASE_URL,
+        'platform_links': render_each(PLATFORM_LINK, blog.platforms),
+        'featured_embed': featured_embed,
+        'posts_section': POSTS_SECTION.render({'post_rows': post_rows}) if post_rows else '',
+    })
+
+
+# ── Sitemaps ──────────────────────────────────────────────────────────────────
+
+SITEMAP_INDEX_PATH = "sitemap_index.xml"
+SITEMAP_PAGES_PATH = "sitemap.xml"
+# URLs per sitemap-pubs-N.xml / sitemap-listings-N.xml (the protocol allows 50,000 / 50 MB)
+SITEMAP_SHARD_URLS = 10000
+_SITEMAP_SHARD_RE = re.compile(r'^sitemap-(?:pubs|listings)-\d+\.xml$')
+
+SITEMAP_URL = Template('''   <url>
+      <loc>{{loc}}</loc>
+      <lastmod>{{lastmod}}</lastmod>
+      <changefreq>{{changefreq}}</changefreq>
+      <priority>{{priority}}</priority>
+   </url>
+''')
+SITEMAP_ENTRY = Template('''   <sitemap>
+      <loc>{{loc}}</loc>
+      <lastmod>{{lastmod}}</lastmod>
+   </sitemap>
+''')
+
+
+def sitemap_urls(manifest, data, publish_blog, today):
+    """Page, publication and listing page URL rows. lastmod is the date the
+    content behind each URL last changed, as recorded in the manifest."""
+    def url(path, changefreq, priority, *content):
+        loc = BASE_URL + path
+        lastmod = manifest.lastmod(loc, content_hash(*content)[:16], today)
+        return {"loc": loc, "lastmod": lastmod, "changefreq": changefreq, "priority": priority}
+
+    pubs = data.publications
+    pages = [
+        url("/", "monthly", "1.0", data.profile, data.education, data.interests,
+            data.experience, data.projects, data.featured_pubs),
+        url("/publications/", "monthly", "0.8", pubs),
+    ]
+    if publish_blog:
+        pages.append(url("/blog/", "monthly", "0.7", data.blog))
+    # Oldest first, so new publications land in the last shard and older shards stay put
+    pub_urls = [url(f"/publications/{pub.id}/", "yearly", "0.6", pub)
+                for pub in sorted(pubs, key=attrgetter("year", "id"))]
+    # A listing page's content is its title and the publications on it
+    listing_urls = [url(f"/{ctx['url']}", "monthly", "0.5", ctx['title'], ctx['pubs'])
+                    for _, ctx in listing_pages(data.sorted_pubs, pub_facets(data.sorted_pubs))]
+    manifest.prune_lastmods({row["loc"] for row in pages + pub_urls + listing_urls})
+    return pages, pub_urls, listing_urls
+
+
+def sitemap_files(pages, pub_urls, listing_urls, shard_urls=SITEMAP_SHARD_URLS):
+    """[(path, urls)] for the pages sitemap and each publication and listing shard."""
+    files = [(SITEMAP_PAGES_PATH, pages)]
+    for kind, urls in (("pubs", pub_urls), ("listings", listing_urls)):
+        shards = [urls[i:i + shard_urls] for i in range(0, len(urls), shard_urls)]
+        files += [(f"sitemap-{kind}-{n}.xml", shard) for n, shard in enumerate(shards, 1)]
+    return files
+
+
+def generate_sitemap(urls):
+    """Stream a <urlset> document."""
+    yield ('<?xml version="1.0" encoding="UTF-8"?>\n'
+           '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+    for url in urls:
+        yield SITEMAP_URL.render(url)
+    yield '</urlset>\n'
+
+
+def generate_sitemap_index(files):
+    """Stream the <sitemapindex> over sitemap_files()."""
+    yield ('<?xml version="1.0" encoding="UTF-8"?>\n'
+           '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+    for path, urls in files:
+        yield SITEMAP_ENTRY.render({"loc": f"{BASE_URL}/{path}", "lastmod": max(url["lastmod"] for url in urls)})
+    yield '</sitemapindex>\n'
+
+
+def remove_stale_sitemaps(files):
+    keep = {path for path, _ in files}
+    for name in WRITER.listdir("."):
+        if _SITEMAP_SHARD_RE.match(name) and name not in keep:
+            WRITER.remove(name)
+
+
+# ── Feeds ─────────────────────────────────────────────────────────────────────
+
+ATOM_FEED_PATH = "feed.xml"
+JSON_FEED_PATH = "feed.json"
+# The quoted hash of the current window, for pollers that only want to know
+# whether either feed changed
+FEED_ETAG_PATH = "feed.etag"
+FEED_ENTRIES = 20
+
+ATOM_HEAD = Template('''<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+   <title>{{title}}</title>
+   <subtitle>{{subtitle}}</subtitle>
+   <id>{{home}}</id>
+   <link href="{{self}}" rel="self" type="application/atom+xml"/>
+   <link href="{{home}}"/>
+   <updated>{{updated}}</updated>
+   <author><name>{{author}}</name></author>
+''')
+ATOM_ENTRY = Template('''   <entry>
+      <title>{{title}}</title>
+      <id>{{id}}</id>
+      <link href="{{url}}"/>
+      <published>{{published}}</published>
+      <updated>{{updated}}</updated>
+{{authors}}{{categories}}      <summary>{{summary}}</summary>
+   </entry>
+''')
+ATOM_AUTHOR = Template('      <author><name>{{name}}</name></author>\n')
+ATOM_CATEGORY = Template('      <category term="{{term}}"/>\n')
+
+
+def feed_timestamp(day):
+    return f"{day}T00:00:00Z"
+
+
+def feed_entries(data, manifest, publish_blog, limit):
+    """The limit newest publications and (if published) blog posts, newest first.
+
+    Publications date from January 1st of their year and count as updated on
+    their sitemap lastmod; posts date from their date.
+    """
+    entries = []
+    for pub in data.sorted_pubs[:limit]:
+        url = f"{BASE_URL}/publications/{pub.id}/"
+        published = f"{pub.year:04d}-01-01"
+        lastmod = manifest.lastmods.get(url, (None, published))[1]
+        entries.append({
+            "id": url, "url": url, "title": pub.title,
+            "summary": pub.abstract or f"{pub.venue} {pub.year}",
+            "published": feed_timestamp(published), "updated": feed_timestamp(max(published, lastmod)),
+            "authors": list(pub.authors), "tags": [pub.type, *pub.tags],
+        })
+    if publish_blog:
+        for post in data.blog.recent_posts[:limit]:
+            entries.append({
+                "id": post.url, "url": post.url, "title": post.title,
+                "summary": f"{post.title} ({post.platform})",
+                "published": feed_timestamp(post.date), "updated": feed_timestamp(post.date),
+                "authors": [], "tags": [post.platform],
+            })
+    entries.sort(key=itemgetter("published"), reverse=True)
+    return entries[:limit]
+
+
+def feed_meta(data, entries):
+    return {
+        "title": f"{data.profile.name}: publications and posts",
+        "subtitle": data.profile.role,
+        "author": data.profile.name,
+        "home": f"{BASE_URL}/",
+        "updated": max((e["updated"] for e in entries), default=feed_timestamp("1970-01-01")),
+    }
+
+
+def generate_atom_feed(meta, entries):
+    """Stream the Atom document."""
+    yield ATOM_HEAD.render({**{k: escape(v) for k, v in meta.items()}, "self": f"{BASE_URL}/{ATOM_FEED_PATH}"})
+    for entry in entries:
+        yield ATOM_ENTRY.render({
+            **{k: escape(entry[k]) for k in ("id", "url", "title", "summary", "published", "updated")},
+            "authors": render_each(ATOM_AUTHOR, [{"name": escape(name)} for name in entry["authors"]]),
+            "categories": render_each(ATOM_CATEGORY, [{"term": escape(tag)} for tag in entry["tags"]]),
+        })
+    yield '</feed>\n'
+
+
+def generate_json_feed(meta, entries):
+    """Stream the JSON Feed 1.1 document, one item per chunk."""
+    head = compact_json({
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": meta["title"],
+        "description": meta["subtitle"],
+        "home_page_url": meta["home"],
+        "feed_url": f"{BASE_URL}/{JSON_FEED_PATH}",
+        "authors": [{"name": meta["author"]}],
+    })
+    yield head[:-1] + ',"items":['
+    for i, entry in enumerate(entries):
+        yield ("," if i else "") + compact_json({
+            "id": entry["id"],
+            "url": entry["url"],
+            "title": entry["title"],
+            "content_text": entry["summary"],
+            "date_published": entry["published"],
+            "date_modified": entry["updated"],
+            "authors": [{"name": name} for name in entry["authors"]],
+            "tags": entry["tags"],
+        })
+    yield ']}\n'
+
+
+# ── Asset fingerprinting ─────────────────────────────────────────────────────
+
+ASSET_MANIFEST_PATH = "assets/asset-manifest.json"
+FINGERPRINT_ASSETS = (
+    "assets/css/base.css",
+    "assets/css/components.css",
+    "assets/js/render.js",
+    "assets/js/main.js",
+    "assets/js/publication.js",
+    "assets/js/publications.js",
+)
+# Matches a reference to an asset by its plain or fingerprinted name
+_ASSET_REF_RE = re.compile(r'assets/(css|js)/([\w-]+?)(?:\.[0-9a-f]{10})?\.(css|js)\b')
+
+
+def fingerprint_assets(enabled, paths=FINGERPRINT_ASSETS):
+    """Write content-hashed copies of the shared CSS/JS in paths.
+
+    Returns the asset manifest: logical path -> path pages should reference.
+    When disabled every asset maps to itself and hashed copies are removed,
+    so a later rewrite_asset_refs() restores the plain names.
+    """
+    asset_map = {}
+    for path in paths:
+        dirname, filename = path.rsplit("/", 1)
+        stem, ext = filename.rsplit(".", 1)
+        if enabled:
+            content = read_file(path)
+            filename = hashed_name(stem, ext, content)
+            write_file(f"{dirname}/{filename}", content)
+        remove_stale_hashed(dirname, stem, ext, filename)
+        asset_map[path] = f"{dirname}/{filename}"
+    if enabled:
+        write_file(ASSET_MANIFEST_PATH, json.dumps(asset_map, indent=2) + "\n")
+    else:
+        remove_output(ASSET_MANIFEST_PATH)
+    return asset_map
+
+
+def rewrite_asset_refs(html, asset_map):
+    """Point every asset reference in html at its entry in asset_map.
+
+    Relative prefixes such as ../../ are left alone; only the file name changes.
+    """
+    def sub(m):
+        return asset_map.get(f"assets/{m.group(1)}/{m.group(2)}.{m.group(3)}", m.group(0))
+    return _ASSET_REF_RE.sub(sub, html)
+
+
+# ── Critical CSS ──────────────────────────────────────────────────────────────
+
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+# Quoted strings are matched whole so braces and semicolons inside them are skipped
+_CSS_TOKEN_RE = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|[{};]')
+_CSS_GROUP_RULES = ("@media", "@supports")
+# Selectors for interaction states never match on first paint
+_CSS_STATE_RE = re.compile(r':(?:hover|focus|focus-within|focus-visible|active|visited)\b')
+_CSS_FUNC_PSEUDO_RE = re.compile(r'::?[\w-]+\([^)]*\)')
+_CSS_ATTR_RE = re.compile(r'\[\s*([\w-]+)[^\]]*\]')
+_CSS_PSEUDO_RE = re.compile(r'::?[\w-]+')
+_CSS_NAME_RE = re.compile(r'[.#]?-?[a-zA-Z_][\w-]*')
+_CSS_DECL_WS_RE = re.compile(r'\s*;\s*')
+_KEYFRAMES_RE = re.compile(r'@(?:-webkit-)?keyframes\s+([\w-]+)')
+
+_STYLESHEET_LINK_RE = re.compile(r'<link rel="stylesheet" href="([^"]+)">')
+_ASYNC_ATTRS = ' media="print" onload="this.media=\'all\'"'
+_ASYNC_LINK_RE = re.compile(r'(<link rel="stylesheet" href="[^"]+")' + re.escape(_ASYNC_ATTRS) + '>')
+# The inlined block repeats the whitespace before the first stylesheet link after itself
+_CRITICAL_BLOCK_RE = re.compile(r'<style id="critical-css">.*?</style><noscript>.*?</noscript>\s*', re.DOTALL)
+_FIRST_STYLESHEET_RE = re.compile(r'(\s*)<link rel="stylesheet" ')
+_CLASS_VALUE_RE = re.compile(r' class="([^"]*)"')
+_ID_VALUE_RE = re.compile(r' id="([^"]*)"')
+_OPEN_TAG_RE = re.compile(r'<([a-zA-Z][\w-]*)')
+_SCRIPT_SRC_RE = re.compile(r'<script src="([^"]+)"')
+_INLINE_SCRIPT_RE = re.compile(r'<script>(.*?)</script>', re.DOTALL)
+_WORD_RE = re.compile(r'[\w-]+')
+
+
+def _parse_css_rules(css, pos):
+    rules = []
+    start = pos
+    while True:
+        m = _CSS_TOKEN_RE.search(css, pos)
+        if m is None or m.group(0) == '}':
+            return rules, m.end() if m else len(css)
+        pos = m.end()
+        if m.group(0) == ';':  # statement at-rule such as @import
+            rules.append((css[start:m.start()].strip(), None))
+        elif m.group(0) == '{':
+            prelude = ' '.join(css[start:m.start()].split())
+            if prelude.startswith(_CSS_GROUP_RULES):
+                body, pos = _parse_css_rules(css, pos)
+            else:
+                depth = 1
+                for t in _CSS_TOKEN_RE.finditer(css, pos):
+                    depth += {'{': 1, '}': -1}.get(t.group(0), 0)
+                    if not depth:
+                        break
+                end = t.start() if depth == 0 else len(css)
+                body = _CSS_DECL_WS_RE.sub(';', ' '.join(css[pos:end].split())).strip(';')
+                pos = min(end + 1, len(css))
+            rules.append((prelude, body))
+        else:
+            continue  # a quoted string inside the current prelude
+        start = pos
+
+
+def parse_css(css):
+    """A stylesheet's rules as (prelude, body) pairs.
+
+    body is the declaration text of a style rule (or @font-face, @keyframes...),
+    a nested rule list for @media/@supports, and None for statements like @import.
+    """
+    return _parse_css_rules(_CSS_COMMENT_RE.sub('', css), 0)[0]
+
+
+@cache
+def selector_tokens(selector):
+    """Tags, .classes, #ids and [attributes a selector needs, or None for state selectors.
+
+    Pseudo-classes and combinators are ignored, so a selector counts as used
+    whenever every element it names could be on the page.
+    """
+    if _CSS_STATE_RE.search(selector):
+        return None
+    s = _CSS_FUNC_PSEUDO_RE.sub('', selector)
+    tokens = {'[' + name for name in _CSS_ATTR_RE.findall(s)}
+    s = _CSS_PSEUDO_RE.sub('', _CSS_ATTR_RE.sub(' ', s))
+    tokens.update(name if name[0] in '.#' else name.lower() for name in _CSS_NAME_RE.findall(s))
+    return frozenset(tokens)
+
+
+def _split_selectors(prelude):
+    return [s.strip() for s in re.split(r',(?![^(]*\))', prelude)]
+
+
+@cache
+def stylesheet(path, digest):
+    """(rules, every token any selector in path needs); digest keys the cache to its content."""
+    rules = parse_css(read_file(path))
+    names = set()
+    def collect(rules):
+        for prelude, body in rules:
+            if isinstance(body, list):
+                collect(body)
+            elif body is not None and not prelude.startswith('@'):
+                for selector in _split_selectors(prelude):
+                    names.update(selector_tokens(selector) or ())
+    collect(rules)
+    return rules, frozenset(names)
+
+
+def _critical_rules(rules, used, out):
+    for prelude, body in rules:
+        if isinstance(body, list):
+            inner = []
+            _critical_rules(body, used, inner)
+            if inner:
+                out.append(f"{prelude}{{{''.join(inner)}}}")
+        elif body is None:
+            continue  # @import and friends would block rendering again
+        elif prelude.startswith('@'):
+            if prelude.startswith('@font-face'):
+                out.append(f"{prelude}{{{body}}}")
+        else:
+            selectors = [s for s in _split_selectors(prelude)
+                         if (tokens := selector_tokens(s)) is not None and tokens <= used]
+            if selectors:
+                out.append(f"{','.join(selectors)}{{{body}}}")
+
+
+@cache
+def critical_css(sheets, digest, used):
+    """The rules of sheets whose selectors only need tokens in used.
+
+    Memoized on the used tokens the sheets know about, so every page built
+    from the same template and data shape shares one computation.
+    """
+    out = []
+    keyframes = []
+    for path in sheets:
+        rules = stylesheet(path, digest)[0]
+        _critical_rules(rules, used, out)
+        keyframes += [(m.group(1), f"{prelude}{{{body}}}") for prelude, body in rules
+                      if isinstance(body, str) and (m := _KEYFRAMES_RE.match(prelude))]
+    css = ''.join(out)
+    words = set(_WORD_RE.findall(css))
+    return css + ''.join(rule for name, rule in keyframes if name in words)
+
+
+@cache
+def script_tokens(scripts, sheets, digest):
+    """The selector tokens of sheets named anywhere in scripts (markup they render, classes they toggle)."""
+    words = set()
+    for path in scripts:
+        words.update(_WORD_RE.findall(read_file(path)))
+    return frozenset(t for path in sheets for t in stylesheet(path, digest)[1]
+                     if t.lstrip('.#[') in words)
+
+
+def _local_asset(url):
+    m = _ASSET_REF_RE.search(url)
+    if m is None or '//' in url:
+        return None
+    path = f"assets/{m.group(1)}/{m.group(2)}.{m.group(3)}"
+    return path if WRITER.exists(path) else None
+
+
+def page_tokens(html):
+    """Tags, .classes, #ids and [attributes present in html's markup and inline scripts."""
+    tokens = {tag.lower() for tag in set(_OPEN_TAG_RE.findall(html))}
+    tokens.update('.' + cls for cls in ' '.join(set(_CLASS_VALUE_RE.findall(html))).split())
+    tokens.update('#' + id for id in set(_ID_VALUE_RE.findall(html)))
+    for word in set(_WORD_RE.findall(' '.join(_INLINE_SCRIPT_RE.findall(html)))):
+        tokens.update((word, '.' + word, '#' + word, '[' + word))
+    return tokens
+
+
+def strip_critical_css(html):
+    """Undo inline_critical_css(): drop the inlined rules and load stylesheets normally."""
+    return _ASYNC_LINK_RE.sub(r'\1>', _CRITICAL_BLOCK_RE.sub('', html))
+
+
+@timed
+def inline_critical_css(html, digest):
+    """Inline the rules html needs to first render and load its stylesheets asynchronously.
+
+    Only local stylesheets are parsed; external ones (icon fonts) just load
+    asynchronously. A <noscript> copy of every link covers visitors without JS.
+    """
+    links = _STYLESHEET_LINK_RE.findall(html)
+    if not links:
+        return html
+    sheets = tuple(path for path in map(_local_asset, links) if path)
+    scripts = tuple(path for path in map(_local_asset, _SCRIPT_SRC_RE.findall(html)) if path)
+    names = frozenset().union(*(stylesheet(path, digest)[1] for path in sheets))
+    used = frozenset(names & (page_tokens(html) | script_tokens(scripts, sheets, digest)))
+    noscript = ''.join(f'<link rel="stylesheet" href="{href}">' for href in links)
+    block = f'<style id="critical-css">{critical_css(sheets, digest, used)}</style><noscript>{noscript}</noscript>'
+    html = _STYLESHEET_LINK_RE.sub(lambda m: f'<link rel="stylesheet" href="{m.group(1)}"{_ASYNC_ATTRS}>', html)
+    return _FIRST_STYLESHEET_RE.sub(lambda m: f'{m.group(1)}{block}{m.group(0)}', html, count=1)
+
+
+# ── Minification ──────────────────────────────────────────────────────────────
+
+HOISTED_CSS_PATH = "assets/css/hoisted.css"
+MINIFY_REPORT_PATH = os.path.join(CACHE_DIR, "minify-report.json")
+
+# Elements whose surrounding whitespace never renders
+_BLOCK_TAGS = frozenset("""
+    html head body title meta link base script style noscript template
+    main header footer nav section article aside div p pre blockquote hr br
+    h1 h2 h3 h4 h5 h6 ul ol li dl dt dd details summary figure figcaption
+    table thead tbody tfoot tr th td form fieldset legend
+""".split())
+# Raw-text elements are kept whole; comments and tags are single tokens
+_HTML_TOKEN_RE = re.compile(
+    r'<(pre|script|style|textarea)\b[^>]*>.*?</\1\s*>|<!--.*?-->|<[^>]*>',
+    re.DOTALL | re.IGNORECASE,
+)
+_TAG_NAME_RE = re.compile(r'</?([a-zA-Z][\w-]*)')
+_JSON_SCRIPT_RE = re.compile(
+    r'(<script\b[^>]*type="application/(?:ld\+)?json"[^>]*>)(.*?)(</script\s*>)',
+    re.DOTALL | re.IGNORECASE,
+)
+_WS_RE = re.compile(r'\s+')
+
+
+def _is_block(tag):
+    m = _TAG_NAME_RE.match(tag)
+    # comments and <!DOCTYPE> have no name and are treated as block-level
+    return m is None or m.group(1).lower() in _BLOCK_TAGS
+
+
+def _compact_json_script(m):
+    try:
+        body = compact_json(json.loads(m.group(2)))
+    except ValueError:
+        return m.group(0)
+    return m.group(1) + body + m.group(3)
+
+
+@timed
+def minify_html(html):
+    """Collapse whitespace in html without changing how it renders.
+
+    Whitespace runs become one space, and are dropped entirely next to
+    block-level tags, comments and the doctype. <pre>, <script>, <style> and
+    <textarea> contents are copied verbatim, except that JSON in
+    <script type="application/(ld+)json"> is re-serialized compactly.
+    """
+    html = _JSON_SCRIPT_RE.sub(_compact_json_script, html)
+    out = []
+    pos = 0
+    prev_block = True
+    for m in _HTML_TOKEN_RE.finditer(html):
+        tag = m.group(0)
+        block = _is_block(tag)
+        text = _WS_RE.sub(' ', html[pos:m.start()])
+        if prev_block:
+            text = text.lstrip(' ')
+        if block:
+            text = text.rstrip(' ')
+        out.append(text)
+        out.append(tag if m.group(1) else _WS_RE.sub(' ', tag))
+        prev_block = block
+        pos = m.end()
+    out.append(_WS_RE.sub(' ', html[pos:]).strip(' ') if prev_block else _WS_RE.sub(' ', html[pos:]))
+    return ''.join(out)
+
+
+_STATIC_STYLE_RE = re.compile(r' style="([^"{}]+)"')
+_STYLED_TAG_RE = re.compile(r'<[a-zA-Z][\w-]*\b[^<>]*? style="([^"]*)"[^<>]*>')
+_CLASS_ATTR_RE = re.compile(r' class="')
+
+
+def hoistable_styles():
+    """style -> generated class name, for every inline style in renderer templates.
+
+    Only styles that are static template text qualify, so the set depends
+    on the markup alone and stays stable across incremental builds.
+    """
+    styles = set()
+    for template in TEMPLATES:
+        for chunk in template.chunks:
+            if chunk.__class__ is str:
+                styles.update(_STATIC_STYLE_RE.findall(chunk))
+    return {
+        style: 's-' + hashlib.sha256(style.encode('utf-8')).hexdigest()[:8]
+        for style in sorted(styles)
+    }
+
+
+def hoisted_css(style_classes):
+    """Stylesheet for hoisted styles.
+
+    hoisted.css is linked after the component stylesheets, so a hoisted
+    class wins over single-class component rules by source order. Rules
+    with a higher specificity (e.g. `.about-details h2`) beat it where the
+    inline style used to win, so they must not set a hoisted property to a
+    different value.
+    """
+    rules = []
+    for style, cls in sorted(style_classes.items(), key=lambda item: item[1]):
+        decls = [d.strip() for d in style.split(';') if d.strip()]
+        rules.append(f".{cls}{{{';'.join(decls)}}}")
+    return '\n'.join(rules) + '\n'
+
+
+@timed
+def hoist_styles(html, style_classes):
+    """Replace hoistable style="..." attributes with their generated class."""
+    def sub(m):
+        cls = style_classes.get(m.group(1))
+        if cls is None:
+            return m.group(0)
+        tag = m.group(0).replace(f' style="{m.group(1)}"', '', 1)
+        if _CLASS_ATTR_RE.search(tag):
+            return _CLASS_ATTR_RE.sub(f' class="{cls} ', tag, count=1)
+        return _TAG_NAME_RE.sub(lambda t: f'{t.group(0)} class="{cls}"', tag, count=1)
+    return _STYLED_TAG_RE.sub(sub, html)
+
+
+_HOISTED_LINK_RE = re.compile(
+    r'\n[ \t]*<link rel="stylesheet" href="[./]*assets/css/hoisted(?:\.[0-9a-f]{10})?\.css">'
+)
+
+
+def link_hoisted_css(html, path, enabled):
+    """Add (or, when disabled, remove) the hoisted.css link in html's <head>."""
+    html = _HOISTED_LINK_RE.sub('', html)
+    if not enabled:
+        return html
+    prefix = '../' * path.count('/')
+    link = f'\n    <link rel="stylesheet" href="{prefix}{HOISTED_CSS_PATH}">'
+    return html.replace('\n</head>', link + '\n</head>', 1)
+
+
+# critical_css is a digest of the shared CSS/JS when inlining is on, so pages
+# re-render when a stylesheet changes, and empty otherwise
+OutputOptions = namedtuple("OutputOptions", "asset_map minify style_classes critical_css")
+
+
+class SizeReport:
+    """Per-output byte sizes before/after minification, kept across builds."""
+
+    def __init__(self, path=MINIFY_REPORT_PATH):
+        self.path = path
+        try:
+            self.entries = load_json(path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}
+
+    def record(self, output, before, after):
+        self.entries[output] = [before, after]
+
+    def totals(self):
+        return (sum(b for b, _ in self.entries.values()),
+                sum(a for _, a in self.entries.values()))
+
+    def print_savings(self, outputs, label="pages", top=5):
+        """Print the bytes saved across outputs and the files that saved most."""
+        rows = sorted(((self.entries[path][0] - self.entries[path][1], path) for path in outputs),
+                      reverse=True)
+        print(f"     {len(rows)} {label}: {sum(saved for saved, _ in rows)} bytes saved")
+        for saved, path in rows[:top]:
+            before, after = self.entries[path]
+            print(f"       {path}: {before} -> {after} bytes ({saved} saved)")
+
+    def save(self):
+        write_file(self.path, json.dumps(self.entries, indent=2, sort_keys=True) + "\n")
+
+
+def finish_block(html, opts):
+    """Post-process a fragment injected into a hand-edited page shell."""
+    if opts.style_classes:
+        html = hoist_styles(html, opts.style_classes)
+    if opts.minify:
+        html = minify_html(html)
+    return html
+
+
+def finish_page(html, path, opts, shell=False):
+    """Post-process a full page before it is written.
+
+    Generated pages are hoisted and minified as a whole. Page shells (shell=True)
+    only get their links (and inlined critical CSS) updated: the markup authored
+    in them is left as is, and their injected blocks already went through
+    finish_block().
+    """
+    html = link_hoisted_css(strip_critical_css(html), path, bool(opts.style_classes))
+    if not shell:
+        html = finish_block(html, opts)
+    if opts.critical_css:
+        html = inline_critical_css(html, opts.critical_css)
+    return rewrite_asset_refs(html, opts.asset_map)
+
+
+def finished_size(html, opts):
+    """Bytes of a finished page for the size report, leaving out the inlined
+    critical CSS so the report only measures what minification saved."""
+    if opts and opts.critical_css:
+        html = strip_critical_css(html)
+    return len(html.encode("utf-8"))
+
+
+# ── Service worker ────────────────────────────────────────────────────────────
+
+SERVICE_WORKER_PATH = "sw.js"
+PRECACHE_MANIFEST_PATH = "precache-manifest.json"
+# Fetched when the worker installs: the page shells, shared CSS/JS and the data
+# bundles they load. Other pages and JSON are cached as they are visited.
+_PRECACHE_RE = re.compile(
+    r'(?:publications/|blog/)?index\.html|assets/.+\.(?:css|js)'
+    r'|data/(?:site|publications\.min)\.[0-9a-f]{10}\.json|data/search-index\.json'
+)
+
+SERVICE_WORKER = Template('''// Generated by build.py from precache-manifest.json; do not edit.
+// Version {{version}}: changes whenever any output listed in the manifest does.
+const PRECACHE = new Map({{precache}});
+const PRECACHE_CACHE = 'sw-precache';
+const RUNTIME_CACHE = 'sw-runtime';
+const MANIFEST_URL = '/{{manifest}}';
+
+// Directory URLs are cached under their index.html
+function cachePath(url) {
+    return url.pathname.endsWith('/') ? url.pathname + 'index.html' : url.pathname;
+}
+
+// Precached files are stored per revision, so an update only fetches what changed
+function precacheKey(path) {
+    return `${path}?__rev=${PRECACHE.get(path)}`;
+}
+
+self.addEventListener('install', event => {
+    event.waitUntil((async () => {
+        const cache = await caches.open(PRECACHE_CACHE);
+        await Promise.all([...PRECACHE.keys()].map(async path => {
+            if (await cache.match(precacheKey(path))) return;
+            const res = await fetch(path, { cache: 'reload' });
+            if (!res.ok) throw new Error(`precache ${path}: HTTP ${res.status}`);
+            await cache.put(precacheKey(path), res);
+        }));
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil((async () => {
+        const keep = new Set([...PRECACHE.keys()].map(path => new URL(precacheKey(path), location).href));
+        const cache = await caches.open(PRECACHE_CACHE);
+        for (const req of await cache.keys()) {
+            if (!keep.has(req.url)) await cache.delete(req);
+        }
+        await purgeRuntime().catch(() => {});
+        await self.clients.claim();
+    })());
+});
+
+// Drop visited files whose revision changed since the manifest was last seen
+async function purgeRuntime() {
+    const cache = await caches.open(RUNTIME_CACHE);
+    const res = await fetch(MANIFEST_URL, { cache: 'reload' });
+    if (!res.ok) return;
+    const files = (await res.clone().json()).files;
+    const old = await cache.match(MANIFEST_URL);
+    const seen = old ? (await old.json()).files : {};
+    for (const req of await cache.keys()) {
+        const path = new URL(req.url).pathname;
+        if (path !== MANIFEST_URL && (!old || files[path] !== seen[path])) await cache.delete(req);
+    }
+    await cache.put(MANIFEST_URL, res);
+}
+
+// Serve the cached copy at once and refresh it in the background
+async function staleWhileRevalidate(event, path) {
+    const cache = await caches.open(RUNTIME_CACHE);
+    const cached = await cache.match(path);
+    const update = fetch(event.request).then(res => {
+        if (res.ok) event.waitUntil(cache.put(path, res.clone()));
+        return res;
+    });
+    if (!cached) return update;
+    event.waitUntil(update.catch(() => {}));
+    return cached;
+}
+
+// Pages come from the network, with the last copy seen as the offline fallback
+async function networkFirst(event, path) {
+    const cache = await caches.open(RUNTIME_CACHE);
+    try {
+        const res = await fetch(event.request);
+        if (res.ok) event.waitUntil(cache.put(path, res.clone()));
+        return res;
+    } catch (e) {
+        return (await cache.match(path)) || Response.error();
+    }
+}
+
+self.addEventListener('fetch', event => {
+    const url = new URL(event.request.url);
+    if (event.request.method !== 'GET' || url.origin !== location.origin) return;
+    const path = cachePath(url);
+    if (PRECACHE.has(path)) {
+        event.respondWith(caches.open(PRECACHE_CACHE)
+            .then(cache => cache.match(precacheKey(path)))
+            .then(res => res || fetch(event.request)));
+    } else if (path.endsWith('.json') && path !== MANIFEST_URL) {
+        event.respondWith(staleWhileRevalidate(event, path));
+    } else if (event.request.mode === 'navigate') {
+        event.respondWith(networkFirst(event, path));
+    }
+});
+''')
+
+# Replaces sw.js once the worker is turned off (and is served by the dev
+# server), so browsers that installed it drop it and its caches
+SERVICE_WORKER_UNINSTALL = '''// Generated by build.py: removes the service worker and its caches.
+self.addEventListener('install', () => self.skipWaiting());
+self.addEventListener('activate', event => event.waitUntil(
+    Promise.all(['sw-precache', 'sw-runtime'].map(name => caches.delete(name)))
+        .then(() => self.registration.unregister())
+));
+'''
+
+SW_REGISTER = '''if ('serviceWorker' in navigator) {
+    window.addEventListener('load', () => {
+        navigator.serviceWorker.register('/sw.js').catch(e => console.error('Service worker:', e));
+    });
+}'''
+
+
+def precache_manifest(hashes):
+    """precache-manifest.json: site URL -> revision of every output in hashes.
+
+    version changes whenever any revision does, and is stamped into sw.js so
+    browsers pick up the new worker.
+    """
+    files = {"/" + path: digest[:10] for path, digest in sorted(hashes.items())}
+    return {"version": content_hash(files)[:10], "files": files}
+
+
+def previous_precache_paths():
+    """Output paths listed in the precache manifest on disk, if any."""
+    try:
+        files = json.loads(read_file(PRECACHE_MANIFEST_PATH))["files"]
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return []
+    return [url[1:] for url in files]
+
+
+def generate_service_worker(sw_manifest):
+    precache = [[url, rev] for url, rev in sw_manifest["files"].items() if _PRECACHE_RE.fullmatch(url[1:])]
+    return SERVICE_WORKER.render({
+        "version": sw_manifest["version"],
+        "precache": compact_json(precache),
+        "manifest": PRECACHE_MANIFEST_PATH,
+    })
+
+
+# ── Precompression ───────────────────────────────────────────────────────────
+
+def precompress(path):
+    """Write path.gz, plus path.br when brotli is installed, at maximum level.
+
+    gzip output uses a zero mtime so identical sources give identical bytes.
+    A .br left by a build with brotli is removed rather than left stale.
+    """
+    data = read_bytes(path)
+    written = write_bytes(path + ".gz", gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        written = write_bytes(path + ".br", brotli.compress(data, quality=11)) or written
+    elif WRITER.exists(path + ".br"):
+        WRITER.remove(path + ".br")
+    return written
+
+
+def precompress_outputs(manifest, paths, jobs):
+    """Precompress every path whose bytes changed since its sidecar was written.
+
+    Returns (written, unchanged, skipped) counts.
+    """
+    keys = {path: FILE_HASHES.get(path) for path in paths}
+    stale = [path for path in paths if not manifest.is_fresh(path + ".gz", keys[path])]
+    # zlib releases the GIL, so threads are enough here
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(precompress, stale))
+    for path in stale:
+        manifest.record(path + ".gz", keys[path])
+    written = sum(results)
+    return written, len(stale) - written, len(paths) - len(stale)
+
+
+def remove_sidecars(manifest, paths):
+    """Delete the .gz/.br sidecars of paths, so none outlives a build without --precompress.
+
+    Returns the number of files removed.
+    """
+    removed = 0
+    for path in paths:
+        manifest.entries.pop(path + ".gz", None)
+        for name in (path + suffix for suffix in SIDECAR_SUFFIXES):
+            if WRITER.exists(name):
+                WRITER.remove(name)
+                removed += 1
+    return removed
+
+
+# ── Watch mode + dev server ───────────────────────────────────────────────────
+
+WATCH_INTERVAL = 0.25
+LIVE_RELOAD_PATH = "/__livereload"
+# Added to HTML responses by the dev server only, never to files on disk
+LIVE_RELOAD_SCRIPT = (
+    '<script>(function(){var g;setInterval(function(){fetch("%s").then(function(r){return r.text()})'
+    '.then(function(t){if(g!==undefined&&t!==g)location.reload();g=t}).catch(function(){})},500)})();</script>'
+    % LIVE_RELOAD_PATH
+)
+
+# Watched input -> build targets (see build()) that depend on it. "index:<name>"
+# re-renders a single BUILD block of index.html; "index" re-renders all of them.
+WATCH_DEPS = {
+    "data/profile.json": {"index:jsonld", "index:about", "index:contact", "index:site-data", "sitemap", "feeds"},
+    "data/education.json": {"index:jsonld", "index:about", "index:site-data", "sitemap"},
+    "data/interests.json": {"index:about", "index:site-data", "sitemap"},
+    "data/experience.json": {"index:experience", "index:site-data", "sitemap"},
+    "data/projects.json": {"index:software", "index:site-data", "sitemap"},
+    "data/publications.json": {"pub-pages", "index:featured-pubs", "index:site-data", "pub-list", "sitemap", "feeds"},
+    "data/blog.json": {"blog", "sitemap", "feeds"},
+    "index.html": {"index"},
+    "publications/index.html": {"pub-list"},
+    "assets/js/render.js": {"render.js"},
+}
+_GENERATED_ASSET_RE = re.compile(r'\.[0-9a-f]{10}\.\w+$|\.(gz|br)$')
+
+
+def watched_files():
+    """Hand-edited inputs: the WATCH_DEPS keys, config and non-generated assets."""
+    paths = [*WATCH_DEPS, "data/config.json"]
+    for dirpath, _, filenames in os.walk("assets"):
+        for name in filenames:
+            path = os.path.join(dirpath, name).replace(os.sep, "/")
+            if path not in WATCH_DEPS and path not in (HOISTED_CSS_PATH, ASSET_MANIFEST_PATH) \
+                    and not _GENERATED_ASSET_RE.search(name):
+                paths.append(path)
+    return paths
+
+
+class Watcher:
+    """Polls files by mtime and size, confirming changes by content hash."""
+
+    def __init__(self, paths):
+        self.paths = paths
+        self.state = {}
+        self.poll()
+
+    def poll(self):
+        """Paths whose content changed, appeared or disappeared since the last poll."""
+        changed, state = set(), {}
+        for path in self.paths():
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            old = self.state.get(path)
+            if old and old[:2] == (st.st_mtime_ns, st.st_size):
+                state[path] = old
+                continue
+            state[path] = (st.st_mtime_ns, st.st_size, file_hash(path))
+            if not old or old[2] != state[path][2]:
+                changed.add(path)
+        changed |= self.state.keys() - state.keys()
+        self.state = state
+        return changed
+
+
+def watch_targets(changed, args):
+    """Build targets for a set of changed inputs; None means a full rebuild."""
+    targets = set()
+    for path in changed:
+        if path in WATCH_DEPS:
+            targets |= WATCH_DEPS[path]
+        elif path.startswith("assets/img/"):
+            targets |= {"index:about", "index:software", "index:site-data"}
+        elif path == "data/config.json":
+            print("  data/config.json changed; restart to apply new defaults")
+        elif args.fingerprint_assets or args.hoist_styles or args.critical_css:
+            return None  # every page links the changed asset by hash
+    return targets
+
+
+def watch(args, server=None):
+    """Rebuild affected outputs whenever a watched input changes, until Ctrl+C."""
+    args = argparse.Namespace(**{**vars(args), "force": False})
+    data = load_site_data()
+    watcher = Watcher(watched_files)
+    print("Watching data/, index.html, publications/index.html and assets/ (Ctrl+C to stop)...")
+    while True:
+        time.sleep(WATCH_INTERVAL)
+        changed = watcher.poll()
+        if not changed:
+            continue
+        start = time.perf_counter()
+        print(f"\nChanged: {', '.join(sorted(changed))}")
+        targets = watch_targets(changed, args)
+        try:
+            data = load_site_data(data, changed)
+        except DataError as e:
+            print(f"  skipped rebuild: {e}")
+            continue
+        if targets is None or targets:
+            STATS.reset()
+            build(args, data, targets)
+            watcher.poll()  # absorb our own writes to shells and render.js
+        if server is not None:
+            server.generation += 1
+        print(f"Rebuilt in {1000 * (time.perf_counter() - start):.0f} ms")
+
+
+class DevRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Serves the working tree, adding a live-reload poller to HTML pages."""
+
+    def do_GET(self):
+        url_path = self.path.split("?", 1)[0].split("#", 1)[0]
+        if url_path == LIVE_RELOAD_PATH:
+            return self.send_body(str(self.server.generation).encode(), "text/plain")
+        if url_path == "/" + SERVICE_WORKER_PATH:  # a cached page would never live-reload
+            return self.send_body(SERVICE_WORKER_UNINSTALL.encode(), "text/javascript")
+        path = self.translate_path(self.path)
+        if url_path.endswith("/") and os.path.isdir(path):
+            path = os.path.join(path, "index.html")
+        if not path.endswith(".html") or not os.path.isfile(path):
+            return super().do_GET()
+        html = read_file(path)
+        at = html.rfind("</body>")
+        html = html[:at] + LIVE_RELOAD_SCRIPT + html[at:] if at >= 0 else html + LIVE_RELOAD_SCRIPT
+        self.send_body(html.encode("utf-8"), "text/html; charset=utf-8")
+
+    def send_body(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def end_headers(self):
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port):
+    """Start the dev server on a background thread; returns it."""
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", port), DevRequestHandler)
+    server.generation = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Serving on http://127.0.0.1:{port}/")
+    return server
+
+
+def develop(args):
+    """--watch / --serve: block until Ctrl+C."""
+    server = serve(args.port) if args.serve else None
+    try:
+        if args.watch:
+            watch(args, server)
+        else:
+            while True:
+                time.sleep(3600)
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        if server is not None:
+            server.shutdown()
+
+
+# ── Link checker ──────────────────────────────────────────────────────────────
+
+# Not part of the published site
+CHECK_SKIP_DIRS = frozenset((".git", ".github", ".vscode", CACHE_DIR, "__pycache__", "node_modules"))
+# A comment, a script or style element (whose body is not markup) or a start
+# tag with attributes. findall() gives the start tags minus their "<" as the
+# first or third group.
+_TAG_RE = re.compile(r'<(?:!--.*?-->|((script|style)\b[^>]*>).*?</\2\s*>|([a-zA-Z][\w-]*\s[^<>]*>))', re.S | re.I)
+# Scheme (http:, mailto:, javascript:, ...) or protocol-relative: not checked
+_EXTERNAL_URL_RE = re.compile(r'[a-zA-Z][a-zA-Z0-9+.-]*:|//')
+
+
+class TagReader(HTMLParser):
+    """Reads the checked attributes of one start tag at a time: href, src,
+    srcset and data-*-src (URLs) and id."""
+
+    def read(self, tag):
+        self.reset()
+        self.found = []
+        self.feed(tag)
+        return tuple(self.found)
+
+    def handle_starttag(self, tag, attrs):
+        for name, value in attrs:
+            if value is None:
+                continue
+            if name in ("href", "src") or (name.startswith("data-") and name.endswith("-src")):
+                self.found.append(("url", value.strip()))
+            elif name == "srcset":
+                self.found.extend(("url", part.split()[0]) for part in value.split(",") if part.strip())
+            elif name == "id":
+                self.found.append(("id", value))
+
+
+_TAG_READER = TagReader()
+
+
+@cache
+def tag_attrs(tag):
+    """_TAG_READER.read() of "<" + tag, memoized: most tags recur on many pages."""
+    return _TAG_READER.read("<" + tag)
+
+
+def site_files():
+    """Every published file, as a set of /-separated paths relative to the root."""
+    files = set()
+    for dirpath, dirnames, filenames in os.walk("."):
+        dirnames[:] = [name for name in dirnames if name not in CHECK_SKIP_DIRS]
+        rel = os.path.relpath(dirpath, ".").replace(os.sep, "/")
+        files.update(name if rel == "." else f"{rel}/{name}" for name in filenames)
+    return files
+
+
+@cache
+def link_parts(url):
+    """(path, fragment) of an internal url, or None if it is external.
+
+    URLs under BASE_URL become site-absolute; the query string is dropped.
+    """
+    if url.startswith(BASE_URL + "/") or url == BASE_URL:
+        url = url[len(BASE_URL):] or "/"
+    if _EXTERNAL_URL_RE.match(url):
+        return None
+    url, _, fragment = url.partition("#")
+    return url.split("?", 1)[0], fragment
+
+
+@cache
+def site_file(dirname, path):
+    """The file that path, relative to dirname or site-absolute, is served from.
+
+    %-escapes are decoded and directory paths serve their index.html. The
+    file may not exist.
+    """
+    target = posixpath.normpath(unquote(path[1:] if path.startswith("/") else posixpath.join(dirname, path)))
+    if path.endswith("/") or target == ".":
+        target = "index.html" if target == "." else target + "/index.html"
+    return target
+
+
+def resolve_link(page, url):
+    """(target file, fragment) that url on page points at, or None if it is external."""
+    parts = link_parts(url)
+    if parts is None:
+        return None
+    path, fragment = parts
+    if not path:
+        return page, fragment
+    return site_file("" if path.startswith("/") else posixpath.dirname(page), path), fragment
+
+
+def check_page(path, files):
+    """Check one HTML page (pool worker).
+
+    Returns (problems, ids, fragment links, number of internal links), where
+    fragment links are (line, url, target, fragment) rows left for the
+    caller, which has every page's ids. Tags are read once per distinct
+    string, and line numbers are only looked up for problems.
+    """
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    line = lambda tag: text.count("\n", 0, text.find("<" + tag)) + 1
+    problems, ids, fragments, links = [], Counter(), [], 0
+    for tag, count in Counter([opening or tag for opening, _, tag in _TAG_RE.findall(text)]).items():
+        for kind, value in tag_attrs(tag) if tag else ():
+            if kind == "id":
+                ids[value] += count
+                continue
+            resolved = resolve_link(path, value)
+            if resolved is None:
+                continue
+            links += count
+            target, fragment = resolved
+            if target not in files and (target.endswith("/index.html") or target + "/index.html" not in files):
+                problems.append(f"{path}:{line(tag)}: broken link {value!r} (no {target})")
+            elif fragment and target.endswith(".html"):
+                fragments.append((line(tag), value, target, fragment))
+    problems += [f"{path}: duplicate id {id_!r} ({count} elements)" for id_, count in ids.items() if count > 1]
+    return problems, set(ids), fragments, links
+
+
+def check_site(jobs=1):
+    """Check every HTML page in the tree without touching the network.
+
+    Reports links and asset references whose target file is missing,
+    #fragments naming no id on the target page, ids used more than once on
+    a page, and publications/<id>/ directories with no such publication in
+    the data. Returns the problems as printable lines.
+    """
+    files = site_files()
+    pages = sorted(path for path in files if path.endswith(".html"))
+    print(f"Checking {len(pages)} pages ({jobs} job{'s' if jobs != 1 else ''})...")
+    # html.parser holds the GIL, so pages are checked on processes, like pub pages are rendered
+    results = map_jobs(partial(check_page, files=files), pages, jobs)
+
+    ids = {page: page_ids for page, (_, page_ids, _, _) in zip(pages, results)}
+    problems = []
+    for page, (page_problems, _, fragments, _) in zip(pages, results):
+        problems += page_problems
+        for line, url, target, fragment in fragments:
+            if fragment not in ids.get(target, (fragment,)):
+                problems.append(f"{page}:{line}: broken link {url!r} (no id {fragment!r} in {target})")
+
+    pub_ids = {pub.id for pub in load_data_file("publications")}
+    pub_dirs = {path.split("/")[1] for path in files if path.startswith(f"{LISTINGS_DIR}/") and path.count("/") >= 2}
+    for name in sorted(pub_dirs - pub_ids - set(LISTING_KINDS)):
+        problems.append(f"{LISTINGS_DIR}/{name}/: orphaned publication directory (no publication {name!r})")
+
+    for problem in problems:
+        print(f"  {problem}")
+    links = sum(r[3] for r in results)
+    print(f"  -> {links} internal links on {len(pages)} pages, "
+          f"{len(problems)} problem{'s' if len(problems) != 1 else ''}")
+    return problems
+
+
+# ── Profiling ─────────────────────────────────────────────────────────────────
+
+PROFILE_PATH = os.path.join(CACHE_DIR, "build.prof")
+
+
+def profile_call(fn, *args, top=25):
+    """Run fn under cProfile and tracemalloc; print the top hotspots by
+    cumulative time and by allocated memory, and save the raw profile."""
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    try:
+        result = profiler.runcall(fn, *args)
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    os.makedirs(os.path.dirname(PROFILE_PATH), exist_ok=True)
+    profiler.dump_stats(PROFILE_PATH)
+    print(f"\nTop {top} functions by cumulative time (full profile in {PROFILE_PATH}):")
+    pstats.Stats(profiler).sort_stats("cumulative").print_stats(top)
+    print(f"Top {top} allocation sites (peak traced memory {peak / 1e6:.1f} MB):")
+    for stat in snapshot.statistics("lineno")[:top]:
+        print(f"  {stat}")
+    return result
 
 
 # ── Main ──────────────────────────────────────────────────────────────────────
 
-def main():
+def main(argv=None):
+    """Build (or check) the site in the current directory. Returns the run's BuildStats as a dict."""
+    STATS.reset()
+    STATS.begin("load")
     config = load_json("data/config.json")
 
     parser = argparse.ArgumentParser(description="Build dreycey.github.io static site.")
+    parser.add_argument("command", nargs="?", choices=("build", "check"), default="build",
+                        help="build (the default) renders the site; check reports broken internal links, "
+                             "duplicate ids and orphaned publication directories in the built tree, "
+                             "exiting 1 if there are any.")
     parser.add_argument("--publish-blog", action=argparse.BooleanOptionalAction,
                         default=config.get("publish_blog", False),
                         help="Include the blog section in the build.")
     parser.add_argument("--publish-resume", action=argparse.BooleanOptionalAction,
                         default=config.get("publish_resume", False),
                         help="Include resume/cv links in the build.")
-    args = parser.parse_args()
+    parser.add_argument("--fingerprint-assets", action=argparse.BooleanOptionalAction,
+                        default=config.get("fingerprint_assets", False),
+                        help="Serve shared CSS/JS under content-hashed names.")
+    parser.add_argument("--service-worker", action=argparse.BooleanOptionalAction,
+                        default=config.get("service_worker", False),
+                        help=f"Write {SERVICE_WORKER_PATH} and {PRECACHE_MANIFEST_PATH} so pages work offline "
+                             "and repeat visits load shared CSS/JS and data from cache.")
+    parser.add_argument("--force", action="store_true",
+                        help="Ignore the build manifest and re-render every output.")
+    parser.add_argument("--fragment-cache-mb", type=int, default=FRAGMENT_CACHE_MB, metavar="N",
+                        help=f"Keep up to N MB of rendered fragments in {FRAGMENT_CACHE_PATH} "
+                             f"(default {FRAGMENT_CACHE_MB}, 0 = no caching).")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Build into a staging directory and list the outputs that would change, "
+                             "without touching the tree.")
+    parser.add_argument("--diff", action="store_true",
+                        help="Like --dry-run, but print a unified diff of every changed output.")
+    parser.add_argument("--feed-entries", type=int, default=FEED_ENTRIES, metavar="N",
+                        help=f"Put the N newest publications and posts in {ATOM_FEED_PATH} and {JSON_FEED_PATH} "
+                             f"(default {FEED_ENTRIES}, 0 = no feeds).")
+    parser.add_argument("--image-widths", type=image_widths, default=IMAGE_WIDTHS, metavar="W,W,...",
+                        help="Write downscaled copies of the home page images at these widths for srcset "
+                             f"(default {','.join(map(str, IMAGE_WIDTHS))}, empty = width/height only; "
+                             "needs Pillow).")
+    parser.add_argument("--search-shard-terms", type=int, default=SEARCH_SHARD_TERMS, metavar="N",
+                        help="Split the search index into prefix shards above N terms (0 = always).")
+    parser.add_argument("--minify", action="store_true",
+                        help="Minify generated HTML and inline JSON-LD (page shells: injected blocks only).")
+    parser.add_argument("--hoist-styles", action="store_true",
+                        help="Move inline styles from renderer templates into generated CSS classes.")
+    parser.add_argument("--critical-css", action="store_true",
+                        help="Inline the CSS rules each page needs to first render and load the full "
+                             "stylesheets asynchronously.")
+    parser.add_argument("--precompress", action="store_true",
+                        help="Write .gz (and .br, if brotli is installed) next to every output.")
+    parser.add_argument("--jobs", "-j", type=int, default=1, metavar="N",
+                        help="Render (or check) pages on N worker processes (0 = one per CPU).")
+    parser.add_argument("--timings", action="store_true",
+                        help="Print per-stage and per-renderer timings after the build.")
+    parser.add_argument("--timings-json", metavar="PATH",
+                        help="Write per-stage and per-renderer timings to PATH as JSON.")
+    parser.add_argument("--profile", type=int, nargs="?", const=25, metavar="N",
+                        help="Run under cProfile and tracemalloc and print the top N hotspots "
+                             f"(default 25; pool workers are not profiled, stats saved to {PROFILE_PATH}).")
+    parser.add_argument("--watch", action="store_true",
+                        help="After building, rebuild the outputs affected by each change to data/, "
+                             "the page shells or assets/.")
+    parser.add_argument("--serve", action="store_true",
+                        help="After building, serve the site locally with live reload.")
+    parser.add_argument("--port", type=int, default=8000, help="Port for --serve (default 8000).")
+    args = parser.parse_args(argv)
+
+    problems = []
+    try:
+        if args.command == "check":
+            STATS.begin("check")
+            problems = check_site(args.jobs if args.jobs > 0 else (os.cpu_count() or 1))
+            STATS.end()
+        elif args.profile:
+            profile_call(build, args, top=args.profile)
+        else:
+            build(args)
+    except DataError as e:  # raised while loading, before any output is written
+        parser.exit(1, f"error: {e}\n")
+
+    if args.timings:
+        print(STATS.table())
+    if args.timings_json:
+        write_file(args.timings_json, json.dumps(STATS.as_dict(), indent=2, sort_keys=True) + "\n")
+    if problems:
+        parser.exit(1, f"error: {len(problems)} problem{'s' if len(problems) != 1 else ''} found\n")
+    stats = STATS.as_dict()
+    if args.watch or args.serve:
+        develop(args)
+    return stats
+
+
+def load_site_data(previous=None, changed=()):
+    """Load and validate every data file, or with previous, only the changed ones.
+
+    Raises DataError before anything is written.
+    """
+    if previous is None:
+        print("Loading data...")
+        return SiteData(**{name: load_data_file(name) for name in DATA_FILES})
+    updates = {name: load_data_file(name) for name, path in DATA_FILES.items() if path in changed}
+    return replace(previous, **updates) if updates else previous
+
+
+def build(args, data=None, only=None):
+    """Run the build stages with the parsed command-line options.
+
+    data is the output of load_site_data() (loaded here if None). only, if
+    given, is a set of targets (see WATCH_DEPS) to re-render; everything
+    else is left as it is on disk. Outputs are staged and moved into place
+    only after every stage has finished; with --dry-run or --diff the
+    changes are reported and discarded instead.
+    """
+    data = data or load_site_data()
+    FRAGMENTS.max_bytes = args.fragment_cache_mb << 20
+    if args.force:
+        FRAGMENTS.clear()
+        FILE_HASHES.clear()
+    WRITER.begin()
+    try:
+        render_site(args, data, only)
+        STATS.begin("commit")
+        if args.dry_run or args.diff:
+            rows = WRITER.changes()
+            print(f"Dry run: {len(rows)} output{'s' if len(rows) != 1 else ''} would change")
+            for status, path in rows:
+                if args.diff:
+                    print(WRITER.diff(status, path), end="")
+                else:
+                    print(f"  {status} {path}")
+            WRITER.discard()
+        else:
+            rows = WRITER.commit()
+            print(f"{len(rows)} output{'s' if len(rows) != 1 else ''} changed")
+    except BaseException:
+        WRITER.discard()
+        raise
+    # Not site outputs, so saved even after a dry run
+    FRAGMENTS.save()
+    FILE_HASHES.save()
+    totals = defaultdict(float, STATS.totals())
+    print(f"Fragment cache: {int(totals['fragment_hits'])} hits, {int(totals['fragment_misses'])} misses, "
+          f"{len(FRAGMENTS.entries)} entries")
+    STATS.end()
+    print("Done!")
+
 
-    print("Loading data...")
-    profile = load_json("data/profile.json")
-    pubs = load_json("data/publications.json")
-    projects = load_json("data/projects.json")
-    experience = load_json("data/experience.json")
-    education = load_json("data/education.json")
-    interests = load_json("data/interests.json")
-    blog_posts = load_json("data/blog.json")
+def render_site(args, data, only):
+    """The stages of build(), writing through WRITER."""
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    wanted = lambda target: only is None or target in only
+
+    profile, pubs, projects = data.profile, data.publications, data.projects
+    experience, education, interests = data.experience, data.education, data.interests
+    blog_posts = data.blog
 
     print(f"Blog publishing:   {'ON' if args.publish_blog else 'OFF'}")
     print(f"Resume publishing: {'ON' if args.publish_resume else 'OFF'}")
 
-    # 1. Generate individual publication pages
-    print(f"Generating {len(pubs)} publication pages...")
-    for pub in pubs:
-        path = f"publications/{pub['id']}/index.html"
-        write_file(path, generate_pub_page(pub))
-        print(f"  -> {path}")
-
-    # 2. Update index.html with pre-rendered sections + Person JSON-LD
-    print("Updating index.html...")
-    index_html = read_file("index.html")
-    index_html = inject_build_block(index_html, "jsonld", person_jsonld(profile, education))
-    index_html = inject_build_block(index_html, "about", render_about_section(profile, education, interests, args.publish_resume))
-    index_html = inject_build_block(index_html, "experience", render_experience_section(experience))
-    index_html = inject_build_block(index_html, "featured-pubs", render_featured_pubs_section(pubs))
-    index_html = inject_build_block(index_html, "software", render_software_section(projects))
-    if args.publish_blog:
-        write_file("blog/index.html", generate_blog_index_page(blog_posts))
-        print("  -> blog/index.html")
-    index_html = inject_build_block(index_html, "blog", '')
-    index_html = inject_build_block(index_html, "contact", render_contact_section(profile))
-    write_file("index.html", index_html)
-    print("  -> index.html")
-
-    # 3. Update render.js nav to include/exclude blog link
-    print("Updating assets/js/render.js...")
-    render_js = read_file("assets/js/render.js")
-    blog_nav_html = '<li><a href="${basePath}blog/index.html">Blog</a></li>' if args.publish_blog else ''
-    render_js = inject_build_block(render_js, "blog-nav", blog_nav_html)
-    write_file("assets/js/render.js", render_js)
-    print("  -> assets/js/render.js")
-
-    # 4. Update publications/index.html with pre-rendered pub list
-    print("Updating publications/index.html...")
-    pubs_html = read_file("publications/index.html")
-    pubs_html = inject_build_block(pubs_html, "publist", render_pub_list(pubs))
-    write_file("publications/index.html", pubs_html)
-    print("  -> publications/index.html")
-
-    # 5. Regenerate sitemap.xml
-    print("Regenerating sitemap.xml...")
-    write_file("sitemap.xml", generate_sitemap(pubs, blog_posts.get('platforms') if args.publish_blog else None))
-    print("  -> sitemap.xml")
-
-    print("Done!")
+    manifest = BuildManifest.load(MANIFEST_PATH)
+    if args.force:
+        manifest.entries.clear()
+    flags = {"publish_blog": args.publish_blog, "publish_resume": args.publish_resume}
+    outputs = []
+    sizes = SizeReport(MINIFY_REPORT_PATH) if args.minify else None
+
+    def track(path, before, after):
+        """Record and print bytes saved by --minify for one output."""
+        if sizes is not None:
+            sizes.record(path, before, after)
+            print(f"     {path}: {before} -> {after} bytes ({before - after} saved)")
+
+    def finish_shell(path, shell_html, blocks):
+        """Inject finished blocks into a page shell, tracking the bytes saved."""
+        finished = {name: finish_block(html, opts) for name, html in blocks.items()}
+        before = sum(len(html.encode("utf-8")) for html in blocks.values())
+        after = sum(len(html.encode("utf-8")) for html in finished.values())
+        html = finish_page(inject_into(path, shell_html, finished), path, opts, shell=True)
+        size = finished_size(html, opts)
+        track(path, size + before - after, size)
+        return html
+
+    # 1. Update render.js nav to include/exclude blog link
+    if wanted("render.js"):
+        STATS.begin("render.js")
+        print("Updating assets/js/render.js...")
+        blog_nav_html = '<li><a href="${basePath}blog/index.html">Blog</a></li>' if args.publish_blog else ''
+        sw_register = SW_REGISTER if args.service_worker else ''
+        report("assets/js/render.js", build_in_place(
+            manifest, "assets/js/render.js", (TEMPLATE_VERSION, flags, args.service_worker),
+            lambda render_js: inject_into("assets/js/render.js", render_js,
+                                          {"blog-nav": blog_nav_html, "sw-register": sw_register})))
+        outputs.append("assets/js/render.js")
+
+    # 2. Hoisted styles + fingerprinted CSS/JS (after render.js, which is one of them)
+    STATS.begin("assets")
+    style_classes = hoistable_styles() if args.hoist_styles else {}
+    assets = FINGERPRINT_ASSETS
+    if style_classes:
+        report(HOISTED_CSS_PATH, "written" if write_file(HOISTED_CSS_PATH, hoisted_css(style_classes)) else "unchanged")
+        assets += (HOISTED_CSS_PATH,)
+        outputs.append(HOISTED_CSS_PATH)
+    else:
+        remove_stale_hashed("assets/css", "hoisted", "css", None)
+        remove_output(HOISTED_CSS_PATH)
+    print(f"Fingerprinting assets: {'ON' if args.fingerprint_assets else 'OFF'}")
+    asset_map = fingerprint_assets(args.fingerprint_assets, assets)
+    if args.fingerprint_assets:
+        outputs += [ASSET_MANIFEST_PATH, *asset_map.values()]
+    css_digest = content_hash(*(FILE_HASHES.get(path) for path in assets))[:16] if args.critical_css else ""
+    opts = OutputOptions(asset_map, args.minify, style_classes, css_digest)
+
+    # 3. Generate individual publication pages
+    if wanted("pub-pages"):
+        STATS.begin("pub-pages")
+        print(f"Generating {len(pubs)} publication pages...")
+        pub_keys = {pub.id: content_hash(TEMPLATE_VERSION, flags, opts, pub) for pub in pubs}
+        stale = [pub for pub in pubs if not manifest.is_fresh(pub_page_path(pub), pub_keys[pub.id])]
+        results = map_jobs(partial(build_pub_page, opts=opts), stale, jobs)
+        for pub, (path, _, before, after) in zip(stale, results):
+            manifest.record(path, pub_keys[pub.id])
+            if sizes is not None:
+                sizes.record(path, before, after)
+        written = sum(1 for r in results if r[1])
+        print(f"  -> {written} written, {len(results) - written} unchanged, "
+              f"{len(pubs) - len(stale)} skipped ({jobs} job{'s' if jobs != 1 else ''})")
+        if sizes is not None and results:
+            sizes.print_savings([r[0] for r in results])
+        for pub in pubs:
+            path = pub_page_path(pub)
+            outputs += [path, os.path.join(os.path.dirname(path), pub_shard_name(pub))]
+
+    # 4. Update index.html with pre-rendered sections, Person JSON-LD + data bundle
+    STATS.begin("index")
+    if args.publish_blog and wanted("blog"):
+        def render_blog_index():
+            html = generate_blog_index_page(blog_posts)
+            finished = finish_page(html, "blog/index.html", opts)
+            track("blog/index.html", len(html.encode("utf-8")), finished_size(finished, opts))
+            return finished
+
+        key = content_hash(TEMPLATE_VERSION, flags, opts, blog_posts)
+        report("blog/index.html", build_output(manifest, "blog/index.html", key, render_blog_index))
+        outputs.append("blog/index.html")
+
+    index_blocks = {
+        "jsonld": lambda: person_jsonld(profile, education),
+        "site-data": lambda: SITE_DATA_PRELOAD.render({'href': site_data_path}),
+        "about": lambda: render_about_section(
+            profile, education, interests, args.publish_resume, images.get(PROFILE_IMAGES[0])),
+        "experience": lambda: render_experience_section(experience),
+        "featured-pubs": lambda: render_featured_pubs_section(data.featured_pubs),
+        "software": lambda: render_software_section(projects, tuple(images.get(p.image) for p in projects)),
+        "blog": lambda: '',
+        "contact": lambda: render_contact_section(profile),
+    }
+    if not wanted("index"):
+        # Blocks not named in only are left as they are in the shell
+        index_blocks = {name: render for name, render in index_blocks.items() if f"index:{name}" in only}
+    if index_blocks:
+        images, variants, skipped = responsive_images(
+            [*PROFILE_IMAGES, *(p.image for p in projects)], args.image_widths)
+        print(f"Sizing {len(images)} images: {len(variants)} variants"
+              + (f", {skipped} skipped (Pillow not installed)" if skipped else ""))
+        print("Updating index.html...")
+        site_data_path, written = write_site_data(
+            profile, data.featured_pubs, projects, experience, education, interests, images)
+        report(site_data_path, "written" if written else "unchanged")
+        outputs.append(site_data_path)
+
+        def render_index(index_html):
+            return finish_shell("index.html", index_html, {name: render() for name, render in index_blocks.items()})
+
+        index_inputs = (TEMPLATE_VERSION, flags, opts, profile, education, interests, experience, pubs, projects, images)
+        report("index.html", build_in_place(manifest, "index.html", index_inputs, render_index))
+        outputs.append("index.html")
+
+    # 5. Update publications/index.html with pre-rendered pub list + search index
+    if wanted("pub-list"):
+        STATS.begin("pub-list")
+        print("Updating publications/index.html...")
+        sorted_pubs = data.sorted_pubs
+        pubs_min_path, written = write_pubs_min(sorted_pubs)
+        report(pubs_min_path, "written" if written else "unchanged")
+        facets = pub_facets(sorted_pubs)
+
+        # publications/index.html is page 1 of the full listing
+        pubs_page, pubs_inputs, pubs_src = "publications/index.html", (TEMPLATE_VERSION, opts, pubs), "../" + pubs_min_path
+        page_count = max(1, -(-len(pubs) // PUBS_PER_PAGE))
+        rel_links, pager = pager_parts(f"{LISTINGS_DIR}/", 1, page_count)
+        first_page = sorted_pubs[:PUBS_PER_PAGE]
+        small_blocks = {"pub-rel": rel_links.rstrip("\n"), "pub-facets": render_facet_nav(facets), "pub-pager": pager}
+        status = None
+        # minify_html() and the critical CSS need the whole page, so only stream without them
+        if not (opts.minify or opts.critical_css):
+            status = stream_in_place(
+                manifest, pubs_page, pubs_inputs, "publist",
+                lambda: (finish_block(chunk, opts) for chunk in iter_pub_list(first_page, pubs_src, len(pubs))),
+                lambda html: finish_page(html, pubs_page, opts, shell=True),
+                {name: finish_block(html, opts) for name, html in small_blocks.items()})
+        if status is None:
+            status = build_in_place(manifest, pubs_page, pubs_inputs, lambda pubs_html: finish_shell(
+                pubs_page, pubs_html, {"publist": render_pub_list(first_page, pubs_src, len(pubs)), **small_blocks}))
+        report(pubs_page, status)
+
+        # Paginated listings: publications/page/N/ and per year, type, author and tag
+        pages = listing_pages(sorted_pubs, facets)
+        page_status = defaultdict(int)
+        rendered = defaultdict(list)
+
+        def render_listing(path, ctx):
+            html = render_listing_page(path, ctx)
+            finished = finish_page(html, path, opts)
+            if sizes is not None:
+                sizes.record(path, len(html.encode("utf-8")), finished_size(finished, opts))
+                rendered[path.split("/")[1]].append(path)
+            return finished
+
+        for path, ctx in pages:
+            key = content_hash(TEMPLATE_VERSION, opts, path, ctx)
+            page_status[build_output(manifest, path, key, partial(render_listing, path, ctx))] += 1
+        remove_stale_listings({path for path, _ in pages})
+        print(f"  -> {len(pages)} listing pages: {page_status['written']} written, "
+              f"{page_status['unchanged']} unchanged, {page_status['skipped']} skipped")
+        for kind in LISTING_KINDS:
+            if rendered[kind]:
+                sizes.print_savings(rendered[kind], f"{kind} listing pages", top=3)
+        outputs += [path for path, _ in pages]
+        key = content_hash(TEMPLATE_VERSION, pubs, args.search_shard_terms)
+        if manifest.is_fresh(SEARCH_INDEX_PATH, key):
+            report(SEARCH_INDEX_PATH, "skipped")
+        else:
+            written = write_search_index(sorted_pubs, args.search_shard_terms)
+            manifest.record(SEARCH_INDEX_PATH, key)
+            report(SEARCH_INDEX_PATH, "written" if written else "unchanged")
+        outputs += [pubs_min_path, "publications/index.html", *search_index_paths()]
+
+    # 6. Regenerate sitemaps (each shard only when its URLs or lastmods changed)
+    if wanted("sitemap"):
+        STATS.begin("sitemap")
+        print("Regenerating sitemaps...")
+        pages, pub_urls, listing_urls = sitemap_urls(manifest, data, args.publish_blog, date.today().isoformat())
+        files = sitemap_files(pages, pub_urls, listing_urls)
+        for path, urls in files:
+            report(path, build_output(
+                manifest, path, content_hash(TEMPLATE_VERSION, urls), partial(generate_sitemap, urls)))
+        report(SITEMAP_INDEX_PATH, build_output(
+            manifest, SITEMAP_INDEX_PATH, content_hash(TEMPLATE_VERSION, files),
+            partial(generate_sitemap_index, files)))
+        remove_stale_sitemaps(files)
+        outputs += [path for path, _ in files] + [SITEMAP_INDEX_PATH]
+
+    # 7. Atom + JSON feeds of the newest entries (after the sitemaps, for their lastmods)
+    if wanted("feeds"):
+        STATS.begin("feeds")
+        feed_paths = (ATOM_FEED_PATH, JSON_FEED_PATH, FEED_ETAG_PATH)
+        if args.feed_entries > 0:
+            print(f"Updating feeds ({args.feed_entries} newest entries)...")
+            entries = feed_entries(data, manifest, args.publish_blog, args.feed_entries)
+            meta = feed_meta(data, entries)
+            # Only the window of newest entries goes into the key, not the whole catalogue
+            key = content_hash(TEMPLATE_VERSION, meta, entries)
+            report(ATOM_FEED_PATH, build_output(manifest, ATOM_FEED_PATH, key, partial(generate_atom_feed, meta, entries)))
+            report(JSON_FEED_PATH, build_output(manifest, JSON_FEED_PATH, key, partial(generate_json_feed, meta, entries)))
+            report(FEED_ETAG_PATH, build_output(manifest, FEED_ETAG_PATH, key, lambda: f'"{key[:16]}"\n'))
+            outputs += feed_paths
+        else:
+            for path in feed_paths:
+                remove_output(path)
+
+    # 8. Service worker + precache manifest, over every other output's final bytes
+    STATS.begin("service-worker")
+    if args.service_worker:
+        print("Generating service worker...")
+        # Pages also load the data files and, unless fingerprinted, the plain CSS/JS
+        paths = {*outputs, *DATA_FILES.values(), *asset_map.values()}
+        if only is not None:  # outputs only lists what was rebuilt
+            paths.update(previous_precache_paths())
+        paths.difference_update(path for path, served in asset_map.items() if path != served)
+        hashes = {}
+        for path in sorted(paths):
+            if os.path.normpath(path) in WRITER.removed:
+                continue
+            try:
+                hashes[path] = FILE_HASHES.get(path)
+            except FileNotFoundError:  # listed last build, gone now
+                pass
+        sw_manifest = precache_manifest(hashes)
+        key = content_hash(TEMPLATE_VERSION, sw_manifest["version"])  # only moves with an output's bytes
+        report(PRECACHE_MANIFEST_PATH, build_output(
+            manifest, PRECACHE_MANIFEST_PATH, key, lambda: json.dumps(sw_manifest, indent=2) + "\n"))
+        report(SERVICE_WORKER_PATH, build_output(
+            manifest, SERVICE_WORKER_PATH, key, partial(generate_service_worker, sw_manifest)))
+        print(f"  -> {len(hashes)} outputs listed, version {sw_manifest['version']}")
+        outputs += [PRECACHE_MANIFEST_PATH, SERVICE_WORKER_PATH]
+    elif WRITER.exists(SERVICE_WORKER_PATH):
+        remove_output(PRECACHE_MANIFEST_PATH)
+        manifest.entries.pop(SERVICE_WORKER_PATH, None)  # so turning it back on rewrites sw.js
+        report(SERVICE_WORKER_PATH, "written" if write_file(SERVICE_WORKER_PATH, SERVICE_WORKER_UNINSTALL) else "unchanged")
+        outputs.append(SERVICE_WORKER_PATH)
+
+    # 9. Precompressed sidecars
+    if args.precompress:
+        STATS.begin("precompress")
+        print(f"Precompressing {len(outputs)} outputs{'' if brotli else ' (gzip only, brotli not installed)'}...")
+        written, unchanged, skipped = precompress_outputs(manifest, outputs, jobs)
+        print(f"  -> {written} written, {unchanged} unchanged, {skipped} skipped")
+    else:
+        STATS.begin("precompress")
+        removed = remove_sidecars(manifest, outputs)
+        if removed:
+            print(f"Removed {removed} precompressed sidecars (--precompress is off)")
+
+    STATS.begin("finish")
+    if sizes is not None:
+        sizes.save()
+        before, after = sizes.totals()
+        print(f"Minified HTML: {before} -> {after} bytes ({before - after} saved, report in {MINIFY_REPORT_PATH})")
+    manifest.save(prune=only is None)
 
 
 if __name__ == "__main__":
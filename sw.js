@@ -0,0 +1,6 @@
+// Generated by build.py: removes the service worker and its caches.
+self.addEventListener('install', () => self.skipWaiting());
+self.addEventListener('activate', event => event.waitUntil(
+    Promise.all(['sw-precache', 'sw-runtime'].map(name => caches.delete(name)))
+        .then(() => self.registration.unregister())
+));
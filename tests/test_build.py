@@ -0,0 +1,192 @@
+"""Behaviour tests for build.py's hand-written parsers.
+
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from dataclasses import replace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import build  # noqa: E402
+
+
+class MinifyHtmlTest(unittest.TestCase):
+
+    def test_drops_whitespace_around_block_tags(self):
+        self.assertEqual(build.minify_html("<div>\n  <p>\n    Hi\n  </p>\n</div>\n"), "<div><p>Hi</p></div>")
+
+    def test_keeps_one_space_between_inline_elements(self):
+        self.assertEqual(build.minify_html("<p><a href=\"/\">one</a>\n   <b>two</b>  three</p>"),
+                         "<p><a href=\"/\">one</a> <b>two</b> three</p>")
+
+    def test_keeps_pre_contents(self):
+        html = "<pre>  line 1\n    line 2\n</pre>"
+        self.assertEqual(build.minify_html(f"<div>\n{html}\n</div>"), f"<div>{html}</div>")
+
+    def test_keeps_script_contents(self):
+        script = "<script>\n  if (a < b) {\n    go();\n  }\n</script>"
+        self.assertEqual(build.minify_html(f"<body>\n  {script}\n</body>"), f"<body>{script}</body>")
+
+    def test_compacts_json_ld(self):
+        html = '<script type="application/ld+json">\n{\n  "a": [1, 2]\n}\n</script>'
+        self.assertEqual(build.minify_html(html), '<script type="application/ld+json">{"a":[1,2]}</script>')
+
+    def test_collapses_whitespace_inside_tags(self):
+        self.assertEqual(build.minify_html('<a\n   href="/"\n   class="x">y</a>'), '<a href="/" class="x">y</a>')
+
+
+class HoistStylesTest(unittest.TestCase):
+
+    def test_replaces_style_with_class(self):
+        classes = {"margin-bottom: 2rem;": "s0"}
+        self.assertEqual(build.hoist_styles('<p class="lead" style="margin-bottom: 2rem;">x</p>', classes),
+                         '<p class="s0 lead">x</p>')
+
+    def test_rules_are_not_important(self):
+        css = build.hoisted_css({"font-size: 1.1rem; margin-bottom: 1rem;": "s0"})
+        self.assertEqual(css, ".s0{font-size: 1.1rem;margin-bottom: 1rem}\n")
+
+
+class CriticalCssTest(unittest.TestCase):
+
+    CSS = """/* comment { } */
+@import url('https://fonts.example/css?family=Inter:wght@400;700');
+.a, .b > p, .c:hover { color: red; }
+@media (max-width: 768px) {
+  @supports (display: grid) {
+    .a { display: grid; }
+  }
+  .d { content: "}"; }
+}
+"""
+
+    def test_parses_statements_rules_and_nested_groups(self):
+        rules = build.parse_css(self.CSS)
+        self.assertEqual(rules[0], ("@import url('https://fonts.example/css?family=Inter:wght@400;700')", None))
+        self.assertEqual(rules[1], (".a, .b > p, .c:hover", "color: red"))
+        media, body = rules[2]
+        self.assertEqual(media, "@media (max-width: 768px)")
+        self.assertEqual(body, [("@supports (display: grid)", [(".a", "display: grid")]),
+                                (".d", 'content: "}"')])
+
+    def test_selector_tokens(self):
+        self.assertEqual(build.selector_tokens("ul.nav > li a::before"), {"ul", ".nav", "li", "a"})
+        self.assertEqual(build.selector_tokens('[data-theme="light"] #hero'), {"[data-theme", "#hero"})
+        self.assertEqual(build.selector_tokens(".card:not(.x) h3"), {".card", "h3"})
+        self.assertIsNone(build.selector_tokens(".btn:hover"))
+
+    def test_keeps_only_used_selectors_of_a_list(self):
+        out = []
+        build._critical_rules(build.parse_css(self.CSS), frozenset({".b", "p", ".c"}), out)
+        self.assertEqual(out, [".b > p{color: red}"])
+
+    def test_keeps_media_blocks_with_used_rules(self):
+        out = []
+        build._critical_rules(build.parse_css(self.CSS), frozenset({".a"}), out)
+        self.assertEqual(out, [".a{color: red}",
+                               "@media (max-width: 768px){@supports (display: grid){.a{display: grid}}}"])
+
+
+class ImageSizeTest(unittest.TestCase):
+
+    def size(self, data):
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(data)
+        self.addCleanup(os.remove, f.name)
+        return build.image_size(f.name)
+
+    def test_png(self):
+        header = b"\x89PNG\r\n\x1a\n" + b"\x00\x00\x00\x0dIHDR" + (1640).to_bytes(4, "big") + (1232).to_bytes(4, "big")
+        self.assertEqual(self.size(header + b"\x08\x06\x00\x00\x00"), (1640, 1232))
+
+    def test_jpeg_skips_segments_before_the_frame_header(self):
+        app0 = b"\xff\xe0" + (16).to_bytes(2, "big") + b"JFIF\x00" + bytes(9)
+        dqt = b"\xff\xdb" + (67).to_bytes(2, "big") + bytes(65)
+        sof2 = b"\xff\xc2" + (17).to_bytes(2, "big") + b"\x08" + (476).to_bytes(2, "big") + (481).to_bytes(2, "big")
+        self.assertEqual(self.size(b"\xff\xd8" + app0 + dqt + sof2 + bytes(12)), (481, 476))
+
+    def test_jpeg_without_frame_header(self):
+        self.assertIsNone(self.size(b"\xff\xd8\xff\xe0\x00\x04ab"))
+
+    def test_webp_lossy(self):
+        vp8 = b"VP8 " + bytes(4) + b"\x00\x00\x00\x9d\x01\x2a" + (640).to_bytes(2, "little") + (480).to_bytes(2, "little")
+        self.assertEqual(self.size(b"RIFF" + bytes(4) + b"WEBP" + vp8), (640, 480))
+
+    def test_webp_lossless(self):
+        bits = (640 - 1) | (480 - 1) << 14
+        vp8l = b"VP8L" + bytes(4) + b"\x2f" + bits.to_bytes(4, "little")
+        self.assertEqual(self.size(b"RIFF" + bytes(4) + b"WEBP" + vp8l + bytes(5)), (640, 480))
+
+    def test_webp_extended(self):
+        vp8x = b"VP8X" + bytes(4) + bytes(4) + (639).to_bytes(3, "little") + (479).to_bytes(3, "little")
+        self.assertEqual(self.size(b"RIFF" + bytes(4) + b"WEBP" + vp8x), (640, 480))
+
+    def test_unknown_format(self):
+        self.assertIsNone(self.size(b"not an image at all, just text"))
+
+
+class SiteDataTest(unittest.TestCase):
+
+    def setUp(self):
+        cwd = os.getcwd()
+        os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.addCleanup(os.chdir, cwd)
+        self.data = build.load_site_data()
+
+    def with_id(self, pub_id):
+        pubs = list(self.data.publications)
+        pubs[1] = replace(pubs[1], id=pub_id)
+        return replace(self.data, publications=tuple(pubs))
+
+    def test_rejects_listing_kinds_as_ids(self):
+        for kind in build.LISTING_KINDS:
+            with self.assertRaisesRegex(build.DataError, "reserved"):
+                self.with_id(kind)
+
+    def test_rejects_duplicate_ids(self):
+        with self.assertRaisesRegex(build.DataError, "duplicate id"):
+            self.with_id(self.data.publications[0].id)
+
+    def test_accepts_other_ids(self):
+        self.assertEqual(self.with_id("tags-2020").publications[1].id, "tags-2020")
+
+
+class NameSlugTest(unittest.TestCase):
+
+    def test_folds_accents(self):
+        self.assertEqual(build.name_slug("Ünïcode Näme"), "unicode-name")
+
+    def test_hashes_names_without_ascii(self):
+        # The same value nameSlug() in publication.js computes with crypto.subtle
+        self.assertEqual(build.name_slug("張偉"), "cd09b14f90")
+
+
+class BuildManifestTest(unittest.TestCase):
+
+    def manifest(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, "manifest.json")
+        return path, build.BuildManifest(path, {"kept.html": "a", "gone.html.gz": "b"}, {"/": ["k", "2024-01-01"]})
+
+    def test_prune_drops_outputs_not_seen(self):
+        path, manifest = self.manifest()
+        manifest.is_fresh("kept.html", "a")
+        manifest.record("new.html", "c")
+        manifest.save(prune=True)
+        saved = build.load_json(path)
+        self.assertEqual(saved["outputs"], {"kept.html": "a", "new.html": "c"})
+        self.assertEqual(saved["lastmod"], {"/": ["k", "2024-01-01"]})
+
+    def test_partial_save_keeps_every_output(self):
+        path, manifest = self.manifest()
+        manifest.save()
+        self.assertEqual(set(build.load_json(path)["outputs"]), {"kept.html", "gone.html.gz"})
+
+
+if __name__ == "__main__":
+    unittest.main()